@@ -1,308 +1,376 @@
+import heapq
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi_cache.decorator import cache
+from sqlalchemy import Date, cast, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import async_session, get_db
 from app.db.models.influencer import Influencer
 from app.db.models.metric import InfluencerMetric
-from app.db.models.audience import AudienceMetric
+from app.db.models.audience import (
+    AGE_BUCKETS,
+    GENDER_BUCKETS,
+    AudienceMetric,
+    unpack_distribution
+)
+from app.db.models.rollup import DailyInfluencerRollup
 
 router = APIRouter()
 
+# Whitelist of rankable metric columns: validates user input and keeps the
+# query shape stable so SQLAlchemy can reuse compiled statements
+METRIC_COLS = {
+    "overall_investment_score": Influencer.overall_investment_score,
+    "engagement_rate": Influencer.engagement_rate,
+    "growth_rate": Influencer.growth_rate,
+    "content_quality_score": Influencer.content_quality_score,
+    "audience_quality_score": Influencer.audience_quality_score,
+    "brand_alignment_score": Influencer.brand_alignment_score,
+    "follower_count": Influencer.follower_count,
+}
+
 
 @router.get("/top-influencers")
-def get_top_influencers(
-    db: Session = Depends(get_db),
+@cache(expire=settings.CACHE_EXPIRE_SECONDS)
+async def get_top_influencers(
+    db: AsyncSession = Depends(get_db),
     limit: int = 10,
     metric: str = "overall_investment_score",
     category: Optional[str] = None
 ) -> Any:
     """Get top influencers by specified metric"""
-    valid_metrics = [
-        "overall_investment_score", "engagement_rate", "growth_rate",
-        "content_quality_score", "audience_quality_score", "brand_alignment_score",
-        "follower_count"
-    ]
-    
-    if metric not in valid_metrics:
+    metric_col = METRIC_COLS.get(metric)
+    if metric_col is None:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid metric. Must be one of: {', '.join(valid_metrics)}"
+            detail=f"Invalid metric. Must be one of: {', '.join(METRIC_COLS)}"
         )
-    
-    query = db.query(Influencer)
-    
+
+    # Select only the columns the response needs, skipping ORM hydration
+    stmt = select(
+        Influencer.id,
+        Influencer.username,
+        Influencer.full_name,
+        Influencer.follower_count,
+        Influencer.category,
+        Influencer.is_verified,
+        Influencer.profile_pic_url,
+        metric_col.label('metric_value')
+    )
+
     if category:
-        query = query.filter(Influencer.category == category)
-    
+        stmt = stmt.where(Influencer.category == category)
+
     # Order by the specified metric
-    query = query.order_by(getattr(Influencer, metric).desc())
-    
-    # Limit results
-    top_influencers = query.limit(limit).all()
-    
+    stmt = stmt.order_by(metric_col.desc()).limit(limit)
+
+    rows = (await db.execute(stmt)).all()
+
     # Format response
     result = [{
-        "id": inf.id,
-        "username": inf.username,
-        "full_name": inf.full_name,
-        "follower_count": inf.follower_count,
-        "category": inf.category,
-        "is_verified": inf.is_verified,
-        "profile_pic_url": inf.profile_pic_url,
+        "id": row.id,
+        "username": row.username,
+        "full_name": row.full_name,
+        "follower_count": row.follower_count,
+        "category": row.category,
+        "is_verified": row.is_verified,
+        "profile_pic_url": row.profile_pic_url,
         "metric_name": metric,
-        "metric_value": getattr(inf, metric)
-    } for inf in top_influencers]
-    
+        "metric_value": row.metric_value
+    } for row in rows]
+
     return result
 
 
+@cache(expire=settings.CACHE_EXPIRE_SECONDS)
+async def _aggregate_growth_trends(days: int) -> Dict:
+    """Aggregate growth trends across all influencers (cached)
+
+    Reads the pre-aggregated daily rollup, so cost stays flat as raw metric
+    history grows. The session is opened inside the helper so the cache key
+    only varies with days; per-influencer trends are served uncached by the
+    endpoint itself.
+    """
+    start_date = datetime.utcnow() - timedelta(days=days)
+    stmt = select(
+        DailyInfluencerRollup.date,
+        func.sum(DailyInfluencerRollup.avg_followers).label('total_followers'),
+        func.avg(DailyInfluencerRollup.avg_growth_rate).label('avg_growth_rate'),
+        func.count(DailyInfluencerRollup.influencer_id).label('influencer_count')
+    ).where(
+        DailyInfluencerRollup.date >= start_date.date()
+    ).group_by(DailyInfluencerRollup.date).order_by(DailyInfluencerRollup.date)
+
+    async with async_session() as db:
+        results = (await db.execute(stmt)).all()
+
+    data_points = [{
+        "date": result.date,
+        "total_followers": int(result.total_followers),
+        "avg_growth_rate": float(result.avg_growth_rate),
+        "influencer_count": result.influencer_count
+    } for result in results]
+
+    return {"data": data_points}
+
+
 @router.get("/growth-trends")
-def get_growth_trends(
-    db: Session = Depends(get_db),
+async def get_growth_trends(
+    db: AsyncSession = Depends(get_db),
     days: int = 90,
     influencer_id: Optional[int] = None
 ) -> Any:
     """Get follower growth trends over time"""
     start_date = datetime.utcnow() - timedelta(days=days)
-    
-    # Base query for metrics
-    query = db.query(
-        InfluencerMetric.influencer_id,
-        func.date_trunc('day', InfluencerMetric.timestamp).label('date'),
-        func.avg(InfluencerMetric.follower_count).label('avg_followers'),
-        func.avg(InfluencerMetric.follower_growth_rate).label('avg_growth_rate')
-    ).filter(InfluencerMetric.timestamp >= start_date)
-    
-    # Filter by influencer if specified
-    if influencer_id:
-        query = query.filter(InfluencerMetric.influencer_id == influencer_id)
-    
-    # Group by date and influencer
-    query = query.group_by(
-        'date',
-        InfluencerMetric.influencer_id
-    ).order_by('date')
-    
-    results = query.all()
-    
-    # Format response
+    # Cast to date so orjson serializes it as YYYY-MM-DD without strftime
+    date_col = cast(func.date_trunc('day', InfluencerMetric.timestamp), Date).label('date')
+
     if influencer_id:
         # Single influencer format
-        influencer = db.query(Influencer).filter(Influencer.id == influencer_id).first()
+        influencer = await db.scalar(
+            select(Influencer).where(Influencer.id == influencer_id).limit(1)
+        )
         if not influencer:
             raise HTTPException(
                 status_code=404,
                 detail=f"Influencer with ID {influencer_id} not found"
             )
-        
+
+        stmt = select(
+            date_col,
+            func.avg(InfluencerMetric.follower_count).label('avg_followers'),
+            func.avg(InfluencerMetric.follower_growth_rate).label('avg_growth_rate')
+        ).where(
+            InfluencerMetric.timestamp >= start_date,
+            InfluencerMetric.influencer_id == influencer_id
+        ).group_by('date').order_by('date')
+
+        results = (await db.execute(stmt)).all()
+
         data_points = [{
-            "date": result.date.strftime("%Y-%m-%d"),
+            "date": result.date,
             "follower_count": int(result.avg_followers),
             "growth_rate": float(result.avg_growth_rate)
         } for result in results]
-        
+
         return {
             "influencer_id": influencer_id,
             "username": influencer.username,
             "data": data_points
         }
     else:
-        # Multiple influencers format (aggregated)
-        # Group by date
-        date_grouped = {}
-        for result in results:
-            date_str = result.date.strftime("%Y-%m-%d")
-            if date_str not in date_grouped:
-                date_grouped[date_str] = {
-                    "date": date_str,
-                    "total_followers": 0,
-                    "avg_growth_rate": 0.0,
-                    "influencer_count": 0
-                }
-            
-            date_grouped[date_str]["total_followers"] += int(result.avg_followers)
-            date_grouped[date_str]["avg_growth_rate"] += float(result.avg_growth_rate)
-            date_grouped[date_str]["influencer_count"] += 1
-        
-        # Calculate averages
-        for date_str, data in date_grouped.items():
-            if data["influencer_count"] > 0:
-                data["avg_growth_rate"] /= data["influencer_count"]
-        
-        # Convert to list and sort by date
-        data_points = list(date_grouped.values())
-        data_points.sort(key=lambda x: x["date"])
-        
-        return {"data": data_points}
+        # Multiple influencers format: served by the cached helper
+        return await _aggregate_growth_trends(days)
 
 
 @router.get("/category-distribution")
-def get_category_distribution(
-    db: Session = Depends(get_db),
+@cache(expire=settings.CACHE_EXPIRE_SECONDS)
+async def get_category_distribution(
+    db: AsyncSession = Depends(get_db),
     min_score: Optional[float] = None
 ) -> Any:
     """Get distribution of influencers by category"""
-    query = db.query(
+    stmt = select(
         Influencer.category,
         func.count(Influencer.id).label('count'),
         func.avg(Influencer.overall_investment_score).label('avg_score')
     )
-    
+
     if min_score is not None:
-        query = query.filter(Influencer.overall_investment_score >= min_score)
-    
+        stmt = stmt.where(Influencer.overall_investment_score >= min_score)
+
     # Group by category
-    query = query.group_by(Influencer.category)
-    
-    results = query.all()
-    
+    stmt = stmt.group_by(Influencer.category)
+
+    results = (await db.execute(stmt)).all()
+
     # Format response
     categories = [{
         "category": result.category or "Uncategorized",
         "count": result.count,
         "avg_score": float(result.avg_score)
     } for result in results]
-    
+
     return {"categories": categories}
 
 
+@cache(expire=settings.CACHE_EXPIRE_SECONDS)
+async def _aggregate_audience_demographics() -> Dict:
+    """Aggregate audience demographics across all influencers (cached)
+
+    The heaviest query in this module (window function plus four
+    jsonb_each_text aggregations), and it carries no per-influencer data,
+    so the result caches safely. The session is opened inside the helper so
+    the cache key does not vary with a request-scoped connection object.
+    """
+    # Select the latest row per influencer with a window function and
+    # aggregate the JSON distributions server-side, so Python only sees
+    # one row per (field, key) pair instead of every metric dict.
+    stmt = text("""
+        WITH ranked AS (
+            SELECT *,
+                   row_number() OVER (
+                       PARTITION BY influencer_id ORDER BY timestamp DESC
+                   ) AS rn
+            FROM audiencemetric
+        ),
+        latest AS (SELECT * FROM ranked WHERE rn = 1),
+        total AS (SELECT count(*) AS n FROM latest)
+        SELECT 'age' AS field, kv.key AS key,
+               SUM(kv.value::float) / (SELECT n FROM total) AS value
+        FROM latest, jsonb_each_text(latest.age_distribution) AS kv
+        GROUP BY kv.key
+        UNION ALL
+        SELECT 'gender', kv.key,
+               SUM(kv.value::float) / (SELECT n FROM total)
+        FROM latest, jsonb_each_text(latest.gender_distribution) AS kv
+        GROUP BY kv.key
+        UNION ALL
+        SELECT 'location', kv.key,
+               SUM(kv.value::float) / (SELECT n FROM total)
+        FROM latest, jsonb_each_text(latest.location_distribution) AS kv
+        GROUP BY kv.key
+        UNION ALL
+        SELECT 'interest', kv.key,
+               SUM(kv.value::float) / (SELECT n FROM total)
+        FROM latest, jsonb_each_text(latest.interest_categories) AS kv
+        GROUP BY kv.key
+    """)
+    async with async_session() as db:
+        rows = (await db.execute(stmt)).all()
+
+    # Split pre-aggregated rows by field
+    age_distribution = {}
+    gender_distribution = {}
+    location_distribution = {}
+    interest_categories = {}
+    field_map = {
+        "age": age_distribution,
+        "gender": gender_distribution,
+        "location": location_distribution,
+        "interest": interest_categories
+    }
+    for field, key, value in rows:
+        field_map[field][key] = float(value)
+
+    # Limit location distribution to top 10 via a bounded heap
+    # instead of fully sorting every distinct key
+    location_distribution = dict(heapq.nlargest(
+        10, location_distribution.items(), key=lambda item: item[1]
+    ))
+
+    # Limit interest categories to top 15
+    interest_categories = dict(heapq.nlargest(
+        15, interest_categories.items(), key=lambda item: item[1]
+    ))
+
+    return {
+        "age_distribution": age_distribution,
+        "gender_distribution": gender_distribution,
+        "location_distribution": location_distribution,
+        "interest_categories": interest_categories
+    }
+
+
 @router.get("/audience-demographics")
-def get_audience_demographics(
-    db: Session = Depends(get_db),
+async def get_audience_demographics(
+    db: AsyncSession = Depends(get_db),
     influencer_id: Optional[int] = None
 ) -> Any:
     """Get audience demographics data"""
     # Get latest audience metrics
     if influencer_id:
-        # For a specific influencer
-        audience_metric = db.query(AudienceMetric).filter(
-            AudienceMetric.influencer_id == influencer_id
-        ).order_by(AudienceMetric.timestamp.desc()).first()
-        
-        if not audience_metric:
+        # For a specific influencer: fetch the latest metric and the
+        # username in one JOIN instead of two round-trips
+        row = (await db.execute(
+            select(AudienceMetric, Influencer.username)
+            .join(Influencer, Influencer.id == AudienceMetric.influencer_id)
+            .where(AudienceMetric.influencer_id == influencer_id)
+            .order_by(AudienceMetric.timestamp.desc())
+            .limit(1)
+        )).first()
+
+        if not row:
             raise HTTPException(
                 status_code=404,
                 detail=f"No audience metrics found for influencer {influencer_id}"
             )
-        
-        influencer = db.query(Influencer).filter(Influencer.id == influencer_id).first()
-        
+
+        audience_metric, username = row
+
+        # Prefer the packed float32 blobs; older rows only carry JSONB
+        age_distribution = unpack_distribution(
+            audience_metric.age_distribution_blob, AGE_BUCKETS
+        ) or audience_metric.age_distribution
+        gender_distribution = unpack_distribution(
+            audience_metric.gender_distribution_blob, GENDER_BUCKETS
+        ) or audience_metric.gender_distribution
+
         return {
             "influencer_id": influencer_id,
-            "username": influencer.username if influencer else None,
-            "age_distribution": audience_metric.age_distribution,
-            "gender_distribution": audience_metric.gender_distribution,
+            "username": username,
+            "age_distribution": age_distribution,
+            "gender_distribution": gender_distribution,
             "location_distribution": audience_metric.location_distribution,
             "interest_categories": audience_metric.interest_categories
         }
     else:
-        # Aggregated across all influencers
-        # Get all latest audience metrics
-        subquery = db.query(
-            AudienceMetric.influencer_id,
-            func.max(AudienceMetric.timestamp).label('max_timestamp')
-        ).group_by(AudienceMetric.influencer_id).subquery('latest_metrics')
-        
-        latest_metrics = db.query(AudienceMetric).join(
-            subquery,
-            (AudienceMetric.influencer_id == subquery.c.influencer_id) &
-            (AudienceMetric.timestamp == subquery.c.max_timestamp)
-        ).all()
-        
-        # Aggregate demographics
-        age_distribution = {}
-        gender_distribution = {}
-        location_distribution = {}
-        interest_categories = {}
-        
-        for metric in latest_metrics:
-            # Aggregate age distribution
-            if metric.age_distribution:
-                for age_group, percentage in metric.age_distribution.items():
-                    if age_group not in age_distribution:
-                        age_distribution[age_group] = 0
-                    age_distribution[age_group] += percentage / len(latest_metrics)
-            
-            # Aggregate gender distribution
-            if metric.gender_distribution:
-                for gender, percentage in metric.gender_distribution.items():
-                    if gender not in gender_distribution:
-                        gender_distribution[gender] = 0
-                    gender_distribution[gender] += percentage / len(latest_metrics)
-            
-            # Aggregate location distribution (top 10)
-            if metric.location_distribution:
-                for location, percentage in metric.location_distribution.items():
-                    if location not in location_distribution:
-                        location_distribution[location] = 0
-                    location_distribution[location] += percentage / len(latest_metrics)
-            
-            # Aggregate interest categories
-            if metric.interest_categories:
-                for category, percentage in metric.interest_categories.items():
-                    if category not in interest_categories:
-                        interest_categories[category] = 0
-                    interest_categories[category] += percentage / len(latest_metrics)
-        
-        # Sort and limit location distribution to top 10
-        location_distribution = dict(sorted(
-            location_distribution.items(), 
-            key=lambda item: item[1], 
-            reverse=True
-        )[:10])
-        
-        # Sort and limit interest categories to top 15
-        interest_categories = dict(sorted(
-            interest_categories.items(), 
-            key=lambda item: item[1], 
-            reverse=True
-        )[:15])
-        
-        return {
-            "age_distribution": age_distribution,
-            "gender_distribution": gender_distribution,
-            "location_distribution": location_distribution,
-            "interest_categories": interest_categories
-        }
+        # Aggregated across all influencers: served by the cached helper
+        return await _aggregate_audience_demographics()
 
 
 @router.get("/investment-opportunities")
-def get_investment_opportunities(
-    db: Session = Depends(get_db),
+@cache(expire=settings.CACHE_EXPIRE_SECONDS)
+async def get_investment_opportunities(
+    db: AsyncSession = Depends(get_db),
     min_score: float = 0.7,
     min_growth_rate: float = 0.1,
     limit: int = 10
 ) -> Any:
     """Get top investment opportunities based on scores and growth"""
-    # Find influencers with high scores and growth rates
-    opportunities = db.query(Influencer).filter(
+    # Find influencers with high scores and growth rates, fetching only
+    # the response columns as plain row tuples
+    stmt = select(
+        Influencer.id,
+        Influencer.username,
+        Influencer.full_name,
+        Influencer.follower_count,
+        Influencer.category,
+        Influencer.overall_investment_score,
+        Influencer.growth_rate,
+        Influencer.engagement_rate,
+        Influencer.audience_quality_score
+    ).where(
         Influencer.overall_investment_score >= min_score,
         Influencer.growth_rate >= min_growth_rate
-    ).order_by(Influencer.overall_investment_score.desc()).limit(limit).all()
-    
+    ).order_by(Influencer.overall_investment_score.desc()).limit(limit)
+
+    rows = (await db.execute(stmt)).all()
+
     # Format response
     result = [{
-        "id": inf.id,
-        "username": inf.username,
-        "full_name": inf.full_name,
-        "follower_count": inf.follower_count,
-        "category": inf.category,
-        "overall_score": inf.overall_investment_score,
-        "growth_rate": inf.growth_rate,
-        "engagement_rate": inf.engagement_rate,
-        "audience_quality": inf.audience_quality_score
-    } for inf in opportunities]
-    
+        "id": row.id,
+        "username": row.username,
+        "full_name": row.full_name,
+        "follower_count": row.follower_count,
+        "category": row.category,
+        "overall_score": row.overall_investment_score,
+        "growth_rate": row.growth_rate,
+        "engagement_rate": row.engagement_rate,
+        "audience_quality": row.audience_quality_score
+    } for row in rows]
+
     return {"opportunities": result}
 
 
 @router.get("/score-distribution")
-def get_score_distribution(
-    db: Session = Depends(get_db)
+@cache(expire=settings.CACHE_EXPIRE_SECONDS)
+async def get_score_distribution(
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """Get distribution of influencers by score ranges"""
     # Define score ranges
@@ -313,20 +381,23 @@ def get_score_distribution(
         {"min": 0.6, "max": 0.8, "label": "High"},
         {"min": 0.8, "max": 1.0, "label": "Very High"}
     ]
-    
-    # Count influencers in each range
-    distribution = []
-    for range_info in ranges:
-        count = db.query(func.count(Influencer.id)).filter(
+
+    # Count all ranges in a single query using filtered aggregates,
+    # instead of one COUNT(*) round-trip per bucket
+    stmt = select(*[
+        func.count(Influencer.id).filter(
             Influencer.overall_investment_score >= range_info["min"],
             Influencer.overall_investment_score < range_info["max"]
-        ).scalar()
-        
-        distribution.append({
-            "range": range_info["label"],
-            "min": range_info["min"],
-            "max": range_info["max"],
-            "count": count
-        })
-    
-    return {"distribution": distribution}
\ No newline at end of file
+        ).label(range_info["label"])
+        for range_info in ranges
+    ])
+    counts = (await db.execute(stmt)).one()
+
+    distribution = [{
+        "range": range_info["label"],
+        "min": range_info["min"],
+        "max": range_info["max"],
+        "count": count
+    } for range_info, count in zip(ranges, counts)]
+
+    return {"distribution": distribution}
@@ -1,25 +1,45 @@
 from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_db, get_sync_db
 from app.db.models.influencer import Influencer
 from app.scoring.scoring_engine import ScoringEngine
 from app.api.api_v1.schemas.influencer import (
-    InfluencerCreate, 
-    InfluencerUpdate, 
+    InfluencerCreate,
+    InfluencerUpdate,
     InfluencerResponse,
-    InfluencerScores,
-    InfluencerList
+    InfluencerList,
+    INFLUENCER_LIST_ADAPTER,
+    INFLUENCER_SCORES_ADAPTER,
+    orm_to_response
 )
 
 router = APIRouter()
 
+# Whitelist of sortable columns: validates user input and keeps the query
+# shape stable so SQLAlchemy can reuse compiled statements
+SORT_COLS = {
+    "overall_investment_score": Influencer.overall_investment_score,
+    "engagement_rate": Influencer.engagement_rate,
+    "growth_rate": Influencer.growth_rate,
+    "content_quality_score": Influencer.content_quality_score,
+    "audience_quality_score": Influencer.audience_quality_score,
+    "brand_alignment_score": Influencer.brand_alignment_score,
+    "follower_count": Influencer.follower_count,
+    "username": Influencer.username,
+    "created_at": Influencer.created_at,
+}
 
-@router.get("/", response_model=List[InfluencerList])
-def get_influencers(
-    db: Session = Depends(get_db),
+
+@router.get("/")
+async def get_influencers(
+    db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
     sort_by: Optional[str] = "overall_investment_score",
@@ -28,41 +48,82 @@ def get_influencers(
     category: Optional[str] = None
 ) -> Any:
     """Get all influencers with optional filtering and sorting"""
-    query = db.query(Influencer)
-    
+    sort_col = SORT_COLS.get(sort_by)
+    if sort_col is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort_by. Must be one of: {', '.join(SORT_COLS)}"
+        )
+
+    # Fetch only the list-view columns as plain row tuples; InfluencerList
+    # reads them by attribute so ORM hydration is unnecessary here
+    stmt = select(
+        Influencer.id,
+        Influencer.username,
+        Influencer.full_name,
+        Influencer.follower_count,
+        Influencer.engagement_rate,
+        Influencer.overall_investment_score,
+        Influencer.category,
+        Influencer.is_verified
+    )
+
     # Apply filters
     if min_score is not None:
-        query = query.filter(Influencer.overall_investment_score >= min_score)
-    
+        stmt = stmt.where(Influencer.overall_investment_score >= min_score)
+
     if category:
-        query = query.filter(Influencer.category == category)
-    
+        stmt = stmt.where(Influencer.category == category)
+
     # Apply sorting
     if sort_order.lower() == "asc":
-        query = query.order_by(getattr(Influencer, sort_by))
+        stmt = stmt.order_by(sort_col.asc())
     else:
-        query = query.order_by(getattr(Influencer, sort_by).desc())
-    
+        stmt = stmt.order_by(sort_col.desc())
+
     # Apply pagination
-    influencers = query.offset(skip).limit(limit).all()
-    return influencers
+    stmt = stmt.offset(skip).limit(limit)
+
+    # Stream rows from a server-side cursor and serialize each partition
+    # through the pre-compiled adapter, so pydantic-core handles a whole
+    # chunk per call and peak memory stays bounded by the chunk size.
+    # .mappings() hands pydantic plain column dicts — no ORM instances,
+    # no identity map, no attribute-descriptor walk
+    async def stream_rows():
+        yield b"["
+        first = True
+        result = await db.stream(stmt.execution_options(yield_per=200))
+        async for partition in result.mappings().partitions(200):
+            chunk = INFLUENCER_LIST_ADAPTER.dump_json(
+                INFLUENCER_LIST_ADAPTER.validate_python(partition)
+            )[1:-1]  # strip the chunk's own brackets
+            if chunk:
+                if not first:
+                    yield b","
+                first = False
+                yield chunk
+        yield b"]"
+
+    return StreamingResponse(stream_rows(), media_type="application/json")
 
 
 @router.post("/", response_model=InfluencerResponse)
-def create_influencer(
+async def create_influencer(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     influencer_in: InfluencerCreate
 ) -> Any:
     """Create new influencer"""
     # Check if influencer already exists
-    db_influencer = db.query(Influencer).filter(Influencer.username == influencer_in.username).first()
+    db_influencer = await db.scalar(
+        select(Influencer).where(Influencer.username == influencer_in.username).limit(1)
+    )
     if db_influencer:
         raise HTTPException(
             status_code=400,
             detail=f"Influencer with username {influencer_in.username} already exists"
         )
-    
+
     # Create new influencer
     influencer = Influencer(
         username=influencer_in.username,
@@ -77,93 +138,113 @@ def create_influencer(
         is_verified=influencer_in.is_verified,
         category=influencer_in.category
     )
-    
+
     db.add(influencer)
-    db.commit()
-    db.refresh(influencer)
+    await db.commit()
+    await db.refresh(influencer)
     return influencer
 
 
-@router.get("/{influencer_id}", response_model=InfluencerResponse)
-def get_influencer(
+@router.get("/{influencer_id}")
+async def get_influencer(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     influencer_id: int
 ) -> Any:
     """Get influencer by ID"""
-    influencer = db.query(Influencer).filter(Influencer.id == influencer_id).first()
+    influencer = await db.scalar(
+        select(Influencer).where(Influencer.id == influencer_id).limit(1)
+    )
     if not influencer:
         raise HTTPException(
             status_code=404,
             detail=f"Influencer with ID {influencer_id} not found"
         )
-    return influencer
+    return orm_to_response(influencer)
 
 
-@router.get("/by-username/{username}", response_model=InfluencerResponse)
-def get_influencer_by_username(
+@router.get("/by-username/{username}")
+async def get_influencer_by_username(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     username: str
 ) -> Any:
     """Get influencer by username"""
-    influencer = db.query(Influencer).filter(Influencer.username == username).first()
+    influencer = await db.scalar(
+        select(Influencer).where(Influencer.username == username).limit(1)
+    )
     if not influencer:
         raise HTTPException(
             status_code=404,
             detail=f"Influencer with username {username} not found"
         )
-    return influencer
+    return orm_to_response(influencer)
 
 
 @router.put("/{influencer_id}", response_model=InfluencerResponse)
-def update_influencer(
+async def update_influencer(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     influencer_id: int,
     influencer_in: InfluencerUpdate
 ) -> Any:
     """Update influencer"""
-    influencer = db.query(Influencer).filter(Influencer.id == influencer_id).first()
+    # Apply the caller-provided fields in a single UPDATE ... RETURNING,
+    # instead of fetch + per-attribute setattr + refresh
+    update_data = influencer_in.dict(exclude_unset=True)
+    if update_data:
+        result = await db.execute(
+            update(Influencer)
+            .where(Influencer.id == influencer_id)
+            .values(**update_data)
+            .returning(Influencer)
+        )
+        influencer = result.scalar_one_or_none()
+        await db.commit()
+    else:
+        influencer = await db.scalar(
+            select(Influencer).where(Influencer.id == influencer_id).limit(1)
+        )
+
     if not influencer:
         raise HTTPException(
             status_code=404,
             detail=f"Influencer with ID {influencer_id} not found"
         )
-    
-    # Update influencer attributes
-    update_data = influencer_in.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(influencer, field, value)
-    
-    db.commit()
-    db.refresh(influencer)
     return influencer
 
 
 @router.delete("/{influencer_id}", response_model=InfluencerResponse)
-def delete_influencer(
+async def delete_influencer(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     influencer_id: int
 ) -> Any:
     """Delete influencer"""
-    influencer = db.query(Influencer).filter(Influencer.id == influencer_id).first()
+    # Eager-load children in single IN queries: the ORM cascade needs them,
+    # and the relationships are lazy="raise"
+    influencer = await db.scalar(
+        select(Influencer).where(Influencer.id == influencer_id).options(
+            selectinload(Influencer.posts),
+            selectinload(Influencer.metrics),
+            selectinload(Influencer.audience_metrics)
+        ).limit(1)
+    )
     if not influencer:
         raise HTTPException(
             status_code=404,
             detail=f"Influencer with ID {influencer_id} not found"
         )
-    
-    db.delete(influencer)
-    db.commit()
+
+    await db.delete(influencer)
+    await db.commit()
     return influencer
 
 
-@router.get("/{influencer_id}/scores", response_model=InfluencerScores)
+@router.get("/{influencer_id}/scores")
 def get_influencer_scores(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_sync_db),
     influencer_id: int,
     industry_categories: Optional[List[str]] = Query(None)
 ) -> Any:
@@ -174,22 +255,25 @@ def get_influencer_scores(
             status_code=404,
             detail=f"Influencer with ID {influencer_id} not found"
         )
-    
+
     # Calculate scores
     scoring_engine = ScoringEngine(db)
     scores = scoring_engine.calculate_overall_score(influencer_id, industry_categories)
-    
-    return {
+
+    payload = {
         "influencer_id": influencer_id,
         "username": influencer.username,
         **scores
     }
+    if not settings.SKIP_RESPONSE_VALIDATION:
+        INFLUENCER_SCORES_ADAPTER.validate_python(payload)
+    return payload
 
 
-@router.post("/{influencer_id}/update-scores", response_model=InfluencerScores)
+@router.post("/{influencer_id}/update-scores")
 def update_influencer_scores(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_sync_db),
     influencer_id: int,
     industry_categories: Optional[List[str]] = Query(None)
 ) -> Any:
@@ -200,13 +284,16 @@ def update_influencer_scores(
             status_code=404,
             detail=f"Influencer with ID {influencer_id} not found"
         )
-    
+
     # Calculate and update scores
     scoring_engine = ScoringEngine(db)
     scores = scoring_engine.update_influencer_scores(influencer_id, industry_categories)
-    
-    return {
+
+    payload = {
         "influencer_id": influencer_id,
         "username": influencer.username,
         **scores
-    }
\ No newline at end of file
+    }
+    if not settings.SKIP_RESPONSE_VALIDATION:
+        INFLUENCER_SCORES_ADAPTER.validate_python(payload)
+    return payload
@@ -1,11 +1,15 @@
 from typing import Any, List, Optional
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.core.cache import clear_cache
+from app.db.rollup import rollup_upsert
+from app.db.session import async_session, get_sync_db
 from app.db.models.influencer import Influencer
 from app.db.models.post import Post
 from app.scrapers.instagram_scraper import InstagramScraper
@@ -14,28 +18,29 @@ from app.api.api_v1.schemas.influencer import InfluencerResponse
 router = APIRouter()
 
 
-async def scrape_influencer_task(username: str, db: Session):
-    """Background task to scrape an influencer's data"""
-    scraper = InstagramScraper()
-    try:
-        await scraper.initialize()
-        
-        # Scrape profile data
-        profile_data = await scraper.get_profile_data(username)
-        
-        if "error" in profile_data:
-            return {"error": profile_data["error"]}
-        
+async def _scrape_influencer(scraper: InstagramScraper, username: str):
+    """Scrape one influencer's profile and posts using an initialized scraper"""
+    # Scrape profile data
+    profile_data = await scraper.get_profile_data(username)
+
+    if "error" in profile_data:
+        return {"error": profile_data["error"]}
+
+    # Open a task-scoped session: the request-scoped session is closed
+    # as soon as the HTTP response is returned, so it must not be reused here
+    async with async_session() as db:
         # Check if influencer exists in database
-        influencer = db.query(Influencer).filter(Influencer.username == username).first()
-        
+        influencer = await db.scalar(
+            select(Influencer).where(Influencer.username == username).limit(1)
+        )
+
         if influencer:
             # Update existing influencer
             for key, value in profile_data.items():
                 if hasattr(influencer, key):
                     setattr(influencer, key, value)
-            
-            influencer.last_scraped_at = datetime.utcnow()
+
+            influencer.last_scraped_at = datetime.now(timezone.utc)
         else:
             # Create new influencer
             influencer = Influencer(
@@ -49,83 +54,157 @@ async def scrape_influencer_task(username: str, db: Session):
                 post_count=profile_data.get("post_count", 0),
                 is_private=profile_data.get("is_private", False),
                 is_verified=profile_data.get("is_verified", False),
-                last_scraped_at=datetime.utcnow()
+                last_scraped_at=datetime.now(timezone.utc)
             )
             db.add(influencer)
-            db.commit()
-            db.refresh(influencer)
-        
+        await db.commit()
+        await db.refresh(influencer)
+
+        # Keep the daily rollup current so dashboard reads never
+        # scan raw metric history
+        await db.execute(rollup_upsert(
+            influencer.id,
+            influencer.follower_count or 0,
+            influencer.growth_rate or 0.0
+        ))
+        await db.commit()
+
         # If profile is not private, scrape recent posts
         if not profile_data.get("is_private", False):
             posts_data = await scraper.get_recent_posts(username, limit=12)
-            
-            for post_data in posts_data:
-                if "error" in post_data:
-                    continue
-                
-                # Check if post exists
-                post = db.query(Post).filter(Post.instagram_id == post_data["instagram_id"]).first()
-                
-                if post:
-                    # Update existing post
-                    for key, value in post_data.items():
-                        if hasattr(post, key):
-                            setattr(post, key, value)
-                else:
-                    # Create new post
-                    post = Post(
-                        instagram_id=post_data["instagram_id"],
-                        influencer_id=influencer.id,
-                        media_type=post_data.get("media_type"),
-                        media_urls=[post_data.get("media_url")] if post_data.get("media_url") else None,
-                        permalink=post_data.get("permalink"),
-                        like_count=post_data.get("like_count", 0),
-                        comment_count=post_data.get("comment_count", 0),
-                        posted_at=datetime.fromisoformat(post_data["timestamp"]) if "timestamp" in post_data else None
-                    )
-                    db.add(post)
-            
-            # Commit all post changes
-            db.commit()
-            
-            # For each post, get detailed information
-            for post_data in posts_data:
-                if "error" in post_data or not post_data.get("permalink"):
-                    continue
-                
-                # Get post details
-                post_details = await scraper.get_post_details(post_data["permalink"])
-                
-                if "error" in post_details:
+            posts_data = [p for p in posts_data if "error" not in p]
+
+            # Upsert all posts in a single round-trip instead of
+            # per-post lookup + add
+            post_values = [{
+                "instagram_id": post_data["instagram_id"],
+                "influencer_id": influencer.id,
+                "media_type": post_data.get("media_type"),
+                "media_urls": [post_data.get("media_url")] if post_data.get("media_url") else None,
+                "permalink": post_data.get("permalink"),
+                "like_count": post_data.get("like_count", 0),
+                "comment_count": post_data.get("comment_count", 0),
+                "posted_at": datetime.fromisoformat(post_data["timestamp"]) if "timestamp" in post_data else None
+            } for post_data in posts_data]
+
+            # Dedupe by instagram_id and drop rows without one: the DOM
+            # fallback can list a pinned post twice, and ON CONFLICT DO
+            # UPDATE aborts if one statement touches the same row twice
+            post_values = list({
+                values["instagram_id"]: values
+                for values in post_values if values["instagram_id"]
+            }.values())
+
+            if post_values:
+                stmt = insert(Post).values(post_values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["instagram_id"],
+                    set_={
+                        "media_type": stmt.excluded.media_type,
+                        "media_urls": stmt.excluded.media_urls,
+                        "permalink": stmt.excluded.permalink,
+                        "like_count": stmt.excluded.like_count,
+                        "comment_count": stmt.excluded.comment_count,
+                        "posted_at": stmt.excluded.posted_at
+                    }
+                )
+                await db.execute(stmt)
+                await db.commit()
+
+            # Fetch all post details concurrently — the fetches are
+            # independent, so total time is the slowest request rather
+            # than the sum of all of them
+            detail_posts = [p for p in posts_data if p.get("permalink")]
+            details = await asyncio.gather(
+                *(scraper.get_post_details(p["permalink"]) for p in detail_posts),
+                return_exceptions=True
+            )
+
+            # Batch the updates into one executemany statement
+            follower_count = influencer.follower_count or 0
+            detail_rows = []
+            for post_data, post_details in zip(detail_posts, details):
+                if isinstance(post_details, Exception) or "error" in post_details:
                     continue
-                
-                # Update post with details
-                post = db.query(Post).filter(Post.instagram_id == post_data["instagram_id"]).first()
-                if post:
-                    post.caption = post_details.get("caption")
-                    post.hashtags = post_details.get("hashtags")
-                    post.mentioned_users = post_details.get("mentioned_users")
-                    post.is_sponsored = post_details.get("is_sponsored", False)
-                    
-                    # Update engagement metrics if available
-                    if "like_count" in post_details and post_details["like_count"] > post.like_count:
-                        post.like_count = post_details["like_count"]
-                    
-                    if "comment_count" in post_details and post_details["comment_count"] > post.comment_count:
-                        post.comment_count = post_details["comment_count"]
-                    
-                    # Calculate engagement rate
-                    if influencer.follower_count > 0:
-                        post.engagement_rate = (post.like_count + post.comment_count) / influencer.follower_count
-            
-            # Commit all detail updates
-            db.commit()
-        
-        return {"success": True, "influencer_id": influencer.id}
-    
+
+                # Keep the higher of the listed and detail engagement counts
+                like_count = max(post_data.get("like_count", 0), post_details.get("like_count", 0))
+                comment_count = max(post_data.get("comment_count", 0), post_details.get("comment_count", 0))
+
+                detail_rows.append({
+                    "iid": post_data["instagram_id"],
+                    "caption": post_details.get("caption"),
+                    "hashtags": post_details.get("hashtags"),
+                    "mentioned_users": post_details.get("mentioned_users"),
+                    "is_sponsored": post_details.get("is_sponsored", False),
+                    "like_count": like_count,
+                    "comment_count": comment_count,
+                    "engagement_rate": (like_count + comment_count) / follower_count if follower_count > 0 else 0.0
+                })
+
+            if detail_rows:
+                await db.execute(
+                    update(Post).where(Post.instagram_id == bindparam("iid")).values(
+                        caption=bindparam("caption"),
+                        hashtags=bindparam("hashtags"),
+                        mentioned_users=bindparam("mentioned_users"),
+                        is_sponsored=bindparam("is_sponsored"),
+                        like_count=bindparam("like_count"),
+                        comment_count=bindparam("comment_count"),
+                        engagement_rate=bindparam("engagement_rate")
+                    ),
+                    detail_rows
+                )
+                await db.commit()
+
+        influencer_id = influencer.id
+
+    return {"success": True, "influencer_id": influencer_id}
+
+
+async def scrape_influencer_task(username: str):
+    """Background task to scrape an influencer's data"""
+    scraper = InstagramScraper()
+    try:
+        await scraper.initialize()
+        result = await _scrape_influencer(scraper, username)
+
+        # Invalidate cached analytics responses now that data changed
+        if "error" not in result:
+            await clear_cache()
+
+        return result
+
     except Exception as e:
         return {"error": str(e)}
-    
+
+    finally:
+        await scraper.close()
+
+
+async def batch_scrape_task(usernames: List[str], concurrency: int = 5):
+    """Background task scraping a whole batch through one shared scraper"""
+    scraper = InstagramScraper()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def scrape_one(username: str):
+        # Bound concurrency so the batch respects Instagram rate limits
+        async with semaphore:
+            try:
+                return await _scrape_influencer(scraper, username)
+            except Exception as e:
+                return {"error": str(e)}
+
+    try:
+        await scraper.initialize()
+        results = await asyncio.gather(*(scrape_one(username) for username in usernames))
+
+        # Invalidate cached analytics responses if anything was written
+        if any("error" not in result for result in results):
+            await clear_cache()
+
+        return results
+
     finally:
         await scraper.close()
 
@@ -134,13 +213,12 @@ async def scrape_influencer_task(username: str, db: Session):
 def scrape_influencer(
     *,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
     username: str
 ) -> Any:
     """Trigger scraping of an influencer's data"""
     # Add scraping task to background tasks
-    background_tasks.add_task(scrape_influencer_task, username, db)
-    
+    background_tasks.add_task(scrape_influencer_task, username)
+
     return {
         "message": f"Scraping of influencer {username} started in the background",
         "status": "processing"
@@ -151,7 +229,6 @@ def scrape_influencer(
 def batch_scrape_influencers(
     *,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
     usernames: List[str]
 ) -> Any:
     """Trigger batch scraping of multiple influencers"""
@@ -160,11 +237,10 @@ def batch_scrape_influencers(
             status_code=400,
             detail="No usernames provided for batch scraping"
         )
-    
-    # Add scraping tasks to background tasks
-    for username in usernames:
-        background_tasks.add_task(scrape_influencer_task, username, db)
-    
+
+    # One background task shares a single scraper session across the batch
+    background_tasks.add_task(batch_scrape_task, usernames)
+
     return {
         "message": f"Batch scraping of {len(usernames)} influencers started in the background",
         "status": "processing",
@@ -175,24 +251,26 @@ def batch_scrape_influencers(
 @router.get("/scrape-status/{username}", response_model=dict)
 def get_scrape_status(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_sync_db),
     username: str
 ) -> Any:
     """Check the scraping status of an influencer"""
     influencer = db.query(Influencer).filter(Influencer.username == username).first()
-    
+
     if not influencer:
         return {
             "username": username,
             "status": "not_found",
             "message": "Influencer not found in database"
         }
-    
+
     # Check last scraped time
     if influencer.last_scraped_at:
-        time_since_scrape = datetime.utcnow() - influencer.last_scraped_at
+        # last_scraped_at comes back timezone-aware from TIMESTAMPTZ, so the
+        # reference point must be aware too
+        time_since_scrape = datetime.now(timezone.utc) - influencer.last_scraped_at
         hours_since_scrape = time_since_scrape.total_seconds() / 3600
-        
+
         if hours_since_scrape < 24:
             status = "recent"
             message = f"Data was scraped {int(hours_since_scrape)} hours ago"
@@ -202,7 +280,7 @@ def get_scrape_status(
     else:
         status = "never_scraped"
         message = "Influencer has never been scraped"
-    
+
     return {
         "username": username,
         "status": status,
@@ -210,4 +288,4 @@ def get_scrape_status(
         "last_scraped_at": influencer.last_scraped_at,
         "follower_count": influencer.follower_count,
         "post_count": influencer.post_count
-    }
\ No newline at end of file
+    }
@@ -1,7 +1,10 @@
 from datetime import datetime
 from typing import Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing_extensions import TypedDict
+
+from app.core.config import settings
 
 
 # Base Influencer Schema
@@ -18,6 +21,10 @@ class InfluencerBase(BaseModel):
     is_verified: Optional[bool] = False
     category: Optional[str] = None
 
+    # Defer pydantic-core schema construction until first use so importing
+    # the app doesn't pay the build cost for every schema up front
+    model_config = ConfigDict(defer_build=True)
+
 
 # Schema for creating a new influencer
 class InfluencerCreate(InfluencerBase):
@@ -43,6 +50,8 @@ class InfluencerUpdate(BaseModel):
     brand_alignment_score: Optional[float] = None
     overall_investment_score: Optional[float] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
 # Schema for influencer list view (limited fields)
 class InfluencerList(BaseModel):
@@ -54,9 +63,10 @@ class InfluencerList(BaseModel):
     overall_investment_score: float
     category: Optional[str] = None
     is_verified: bool
-    
-    class Config:
-        orm_mode = True
+
+    # frozen lets pydantic-core skip per-instance mutation bookkeeping;
+    # response instances are write-once anyway
+    model_config = ConfigDict(from_attributes=True, defer_build=True, frozen=True)
 
 
 # Schema for full influencer response
@@ -71,13 +81,29 @@ class InfluencerResponse(InfluencerBase):
     created_at: datetime
     updated_at: datetime
     last_scraped_at: Optional[datetime] = None
-    
-    class Config:
-        orm_mode = True
+
+    model_config = ConfigDict(from_attributes=True, defer_build=True, frozen=True)
+
+
+# Pre-compiled adapter: serializes a whole page of rows in one
+# pydantic-core call instead of one model construction per row
+INFLUENCER_LIST_ADAPTER = TypeAdapter(List[InfluencerList])
 
 
-# Schema for influencer scores
-class InfluencerScores(BaseModel):
+def orm_to_response(row) -> "InfluencerResponse":
+    """Build an InfluencerResponse from an ORM row, skipping per-field
+    validation when SKIP_RESPONSE_VALIDATION is set — the DB schema already
+    enforces these types"""
+    data = {c.name: getattr(row, c.name) for c in row.__table__.columns}
+    if settings.SKIP_RESPONSE_VALIDATION:
+        return InfluencerResponse.model_construct(**data)
+    return InfluencerResponse.model_validate(data)
+
+
+# Schema for influencer scores: a TypedDict rather than a BaseModel, since
+# the scores endpoints already build plain dicts — validating through the
+# adapter avoids constructing a model instance per response
+class InfluencerScores(TypedDict):
     influencer_id: int
     username: str
     overall_investment_score: float
@@ -88,6 +114,9 @@ class InfluencerScores(BaseModel):
     brand_alignment_score: float
 
 
+INFLUENCER_SCORES_ADAPTER = TypeAdapter(InfluencerScores)
+
+
 # Schema for historical metrics
 class InfluencerMetricResponse(BaseModel):
     id: int
@@ -104,9 +133,8 @@ class InfluencerMetricResponse(BaseModel):
     overall_investment_score: float
     trend_direction: str
     trend_strength: float
-    
-    class Config:
-        orm_mode = True
+
+    model_config = ConfigDict(from_attributes=True, defer_build=True, frozen=True)
 
 
 # Schema for audience metrics
@@ -126,6 +154,5 @@ class AudienceMetricResponse(BaseModel):
     purchasing_power_score: float
     brand_affinity_score: float
     influence_multiplier: float
-    
-    class Config:
-        orm_mode = True
\ No newline at end of file
+
+    model_config = ConfigDict(from_attributes=True, defer_build=True, frozen=True)
\ No newline at end of file
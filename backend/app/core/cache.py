@@ -0,0 +1,37 @@
+from hashlib import md5
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+CACHE_PREFIX = "infl"
+
+
+def cache_key_builder(func, namespace="", *, request=None, response=None, args=(), kwargs=None):
+    """Build a cache key from the endpoint name and its sorted query params"""
+    kwargs = kwargs or {}
+    # Exclude the DB session dependency so keys only vary with real params
+    params = "&".join(
+        f"{key}={value}" for key, value in sorted(kwargs.items()) if key != "db"
+    )
+    return f"{CACHE_PREFIX}:{namespace}:{func.__name__}:{md5(params.encode()).hexdigest()}"
+
+
+async def init_cache():
+    """Initialize the Redis-backed response cache"""
+    redis = aioredis.from_url(settings.REDIS_URL)
+    FastAPICache.init(RedisBackend(redis), prefix=CACHE_PREFIX, key_builder=cache_key_builder)
+
+
+async def clear_cache():
+    """Invalidate all cached analytics responses (called after ingest writes)
+
+    Called with no namespace on purpose: FastAPICache.clear joins the
+    backend prefix and namespace as "{prefix}:{namespace}", so passing
+    CACHE_PREFIX again would scan KEYS 'infl:infl:*' and delete nothing.
+    Without a namespace the Redis backend scans 'infl:*', which matches the
+    'infl:{namespace}:{endpoint}:{hash}' keys cache_key_builder produces.
+    """
+    await FastAPICache.clear()
@@ -1,7 +1,8 @@
-import os
-from typing import Any, Dict, List, Optional, Union
+from functools import cached_property, lru_cache
+from typing import Any, List, Optional, Tuple, Union
+from urllib.parse import quote_plus
 
-from pydantic import AnyHttpUrl, PostgresDsn
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -9,42 +10,58 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Instagram Influencer Investment Analysis"
     
-    # CORS Configuration
-    BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
+    # CORS Configuration: a frozen tuple of concrete origins lets
+    # CORSMiddleware use set membership instead of its wildcard path;
+    # parsing runs once per process via get_settings
+    BACKEND_CORS_ORIGINS: Tuple[str, ...] = ()
 
-    @validator("BACKEND_CORS_ORIGINS", pre=True)
-    def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
+    @field_validator("BACKEND_CORS_ORIGINS", mode="before")
+    @classmethod
+    def assemble_cors_origins(cls, v: Union[str, List[str], Tuple[str, ...]]) -> Any:
         if isinstance(v, str) and not v.startswith("["):
-            return [i.strip() for i in v.split(",")]
-        elif isinstance(v, (list, str)):
+            return tuple(i.strip() for i in v.split(","))
+        elif isinstance(v, (list, tuple, str)):
             return v
         raise ValueError(v)
 
-    # Database Configuration
-    POSTGRES_SERVER: str = os.getenv("POSTGRES_SERVER", "localhost")
-    POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
-    POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
-    POSTGRES_DB: str = os.getenv("POSTGRES_DB", "influencer_analysis")
-    SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
+    # Database Configuration (BaseSettings binds env vars itself;
+    # no explicit os.getenv needed)
+    POSTGRES_SERVER: str = "localhost"
+    POSTGRES_USER: str = "postgres"
+    POSTGRES_PASSWORD: str = "postgres"
+    POSTGRES_DB: str = "influencer_analysis"
+    # Plain string, not PostgresDsn: a full override skips pydantic's URL
+    # validation (regex + idna resolution) on the cold import path
+    SQLALCHEMY_DATABASE_URI: Optional[str] = None
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
 
-    @validator("SQLALCHEMY_DATABASE_URI", pre=True)
-    def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
-        if isinstance(v, str):
-            return v
-        return PostgresDsn.build(
-            scheme="postgresql",
-            user=values.get("POSTGRES_USER"),
-            password=values.get("POSTGRES_PASSWORD"),
-            host=values.get("POSTGRES_SERVER"),
-            path=f"/{values.get('POSTGRES_DB') or ''}",
+    @cached_property
+    def dsn(self) -> str:
+        """DSN string assembled once; engines read this instead of the field"""
+        if self.SQLALCHEMY_DATABASE_URI:
+            return self.SQLALCHEMY_DATABASE_URI
+        return (
+            f"postgresql://{self.POSTGRES_USER}:{quote_plus(self.POSTGRES_PASSWORD)}"
+            f"@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
         )
     
+    # Response Serialization
+    # Skip Pydantic validation when building responses from ORM rows whose
+    # types the DB schema already enforces; set False to re-validate in tests
+    SKIP_RESPONSE_VALIDATION: bool = True
+
+    # Cache Configuration
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_EXPIRE_SECONDS: int = 3600  # Analytics responses change at most hourly
+
     # Instagram Scraper Configuration
     PROXY_LIST: List[str] = []
     PROXY_ROTATION_INTERVAL: int = 10  # minutes
     REQUEST_TIMEOUT: int = 30  # seconds
     REQUEST_RETRY_COUNT: int = 3
     USER_AGENT_ROTATION: bool = True
+    SCRAPER_POOL_SIZE: int = 3  # Concurrent browsers in the scraper pool
     
     # Scoring Engine Configuration
     ENGAGEMENT_RATE_WEIGHT: float = 0.3
@@ -58,4 +75,10 @@ class Settings(BaseSettings):
         env_file = ".env"
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Construct Settings (and run its validators) exactly once per process"""
+    return Settings()
+
+
+settings = get_settings()
\ No newline at end of file
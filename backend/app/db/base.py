@@ -3,4 +3,9 @@ from app.db.base_class import Base  # noqa
 from app.db.models.influencer import Influencer  # noqa
 from app.db.models.post import Post  # noqa
 from app.db.models.metric import InfluencerMetric  # noqa
-from app.db.models.audience import AudienceMetric  # noqa
\ No newline at end of file
+from app.db.models.audience import AudienceMetric  # noqa
+from app.db.models.rollup import DailyInfluencerRollup  # noqa
+
+# Compile all mappers eagerly: under gunicorn --preload the parent does this
+# once and forked workers inherit the configured registry via copy-on-write
+Base.registry.configure()
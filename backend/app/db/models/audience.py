@@ -1,22 +1,53 @@
-from datetime import datetime
+from typing import Dict, Optional, Tuple
 
-from sqlalchemy import Column, DateTime, Integer, Float, ForeignKey, JSON
+import numpy as np
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
 
+# Fixed bucket orders for the packed binary distributions: a blob is a plain
+# float32 array in this order, so no key names travel with each row
+AGE_BUCKETS = ("13-17", "18-24", "25-34", "35-44", "45-54", "55-64", "65+")
+GENDER_BUCKETS = ("male", "female", "other")
+
+
+def pack_distribution(dist: Optional[Dict[str, float]], buckets: Tuple[str, ...]) -> Optional[bytes]:
+    """Pack a distribution dict into a float32 blob in bucket order"""
+    if dist is None:
+        return None
+    return np.array([dist.get(bucket, 0.0) for bucket in buckets], dtype=np.float32).tobytes()
+
+
+def unpack_distribution(blob: Optional[bytes], buckets: Tuple[str, ...]) -> Optional[Dict[str, float]]:
+    """Unpack a float32 blob back into a {bucket: value} dict"""
+    if blob is None:
+        return None
+    values = np.frombuffer(blob, dtype=np.float32)
+    return {bucket: float(value) for bucket, value in zip(buckets, values)}
+
 
 class AudienceMetric(Base):
-    id = Column(Integer, primary_key=True, index=True)
+    # autoincrement must be explicit: with the composite (id, timestamp)
+    # key SQLAlchemy no longer infers SERIAL for id on its own
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     influencer_id = Column(Integer, ForeignKey("influencer.id"), nullable=False)
     
-    # Timestamp for this metric snapshot
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    # Timestamp for this metric snapshot (TIMESTAMPTZ, stamped by the DB).
+    # Part of the primary key because it is the range-partition key
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True, primary_key=True)
     
     # Demographic data
-    age_distribution = Column(JSON, nullable=True)  # e.g., {"18-24": 0.25, "25-34": 0.45, ...}
-    gender_distribution = Column(JSON, nullable=True)  # e.g., {"male": 0.4, "female": 0.6}
-    location_distribution = Column(JSON, nullable=True)  # e.g., {"Tehran": 0.3, "Isfahan": 0.15, ...}
+    age_distribution = Column(JSONB, nullable=True)  # e.g., {"18-24": 0.25, "25-34": 0.45, ...}
+    gender_distribution = Column(JSONB, nullable=True)  # e.g., {"male": 0.4, "female": 0.6}
+    location_distribution = Column(JSONB, nullable=True)  # e.g., {"Tehran": 0.3, "Isfahan": 0.15, ...}
+
+    # Packed float32 copies of the fixed-bucket distributions (AGE_BUCKETS /
+    # GENDER_BUCKETS order): smaller on the wire and no JSON decode on read.
+    # Writers fill both; readers prefer the blob and fall back to JSONB
+    age_distribution_blob = Column(LargeBinary, nullable=True)
+    gender_distribution_blob = Column(LargeBinary, nullable=True)
     
     # Audience quality metrics
     authentic_followers_ratio = Column(Float, default=0.0)  # Estimated real followers (0.0-1.0)
@@ -28,15 +59,23 @@ class AudienceMetric(Base):
     loyalty_score = Column(Float, default=0.0)  # Consistency of engagement from same users
     
     # Audience interests
-    interest_categories = Column(JSON, nullable=True)  # e.g., {"fashion": 0.4, "technology": 0.2, ...}
+    interest_categories = Column(JSONB, nullable=True)  # e.g., {"fashion": 0.4, "technology": 0.2, ...}
     
     # VC-specific audience metrics
     purchasing_power_score = Column(Float, default=0.0)  # Estimated purchasing power (0.0-1.0)
     brand_affinity_score = Column(Float, default=0.0)  # Affinity to brands/products (0.0-1.0)
     influence_multiplier = Column(Float, default=1.0)  # How influential the audience is themselves
     
+    # Covers latest-metric-per-influencer lookups; GIN index supports
+    # containment queries over audience interests
+    __table_args__ = (
+        Index("ix_audiencemetric_influencer_timestamp", influencer_id, timestamp.desc()),
+        Index("ix_audience_interests_gin", interest_categories, postgresql_using="gin"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
     # Relationships
-    influencer = relationship("Influencer", back_populates="audience_metrics")
+    influencer = relationship("Influencer", back_populates="audience_metrics", lazy="raise")
     
     def __repr__(self):
         return f"<AudienceMetric {self.influencer_id} at {self.timestamp}>"
\ No newline at end of file
@@ -1,7 +1,6 @@
-from datetime import datetime
 from typing import List
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, Float
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text, Float, func
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -14,30 +13,37 @@ class Influencer(Base):
     bio = Column(Text, nullable=True)
     profile_pic_url = Column(String, nullable=True)
     external_url = Column(String, nullable=True)
-    follower_count = Column(Integer, default=0)
+    follower_count = Column(Integer, default=0, index=True)
     following_count = Column(Integer, default=0)
     post_count = Column(Integer, default=0)
     is_private = Column(Boolean, default=False)
     is_verified = Column(Boolean, default=False)
     category = Column(String, nullable=True)
     
-    # VC-specific metrics
-    engagement_rate = Column(Float, default=0.0)
-    growth_rate = Column(Float, default=0.0)
-    content_quality_score = Column(Float, default=0.0)
-    audience_quality_score = Column(Float, default=0.0)
-    brand_alignment_score = Column(Float, default=0.0)
-    overall_investment_score = Column(Float, default=0.0)
+    # VC-specific metrics (indexed: the analytics endpoints ORDER BY each of these)
+    engagement_rate = Column(Float, default=0.0, index=True)
+    growth_rate = Column(Float, default=0.0, index=True)
+    content_quality_score = Column(Float, default=0.0, index=True)
+    audience_quality_score = Column(Float, default=0.0, index=True)
+    brand_alignment_score = Column(Float, default=0.0, index=True)
+    overall_investment_score = Column(Float, default=0.0, index=True)
     
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_scraped_at = Column(DateTime, nullable=True)
+    # Timestamps: TIMESTAMPTZ with server-side defaults, so the DB stamps
+    # rows instead of Python allocating a datetime per INSERT
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    last_scraped_at = Column(DateTime(timezone=True), nullable=True)
     
-    # Relationships
-    posts = relationship("Post", back_populates="influencer", cascade="all, delete-orphan")
-    metrics = relationship("InfluencerMetric", back_populates="influencer", cascade="all, delete-orphan")
-    audience_metrics = relationship("AudienceMetric", back_populates="influencer", cascade="all, delete-orphan")
+    # Relationships. lazy="raise" makes accidental per-row lazy loads fail
+    # fast; callers opt in with selectinload(...) where children are needed
+    posts = relationship("Post", back_populates="influencer", cascade="all, delete-orphan", lazy="raise")
+    metrics = relationship("InfluencerMetric", back_populates="influencer", cascade="all, delete-orphan", lazy="raise")
+    audience_metrics = relationship("AudienceMetric", back_populates="influencer", cascade="all, delete-orphan", lazy="raise")
     
+    # Covers the category-filtered top-N queries in the analytics endpoints
+    __table_args__ = (
+        Index("ix_influencer_category_score", category, overall_investment_score.desc()),
+    )
+
     def __repr__(self):
         return f"<Influencer {self.username}>"
\ No newline at end of file
@@ -1,17 +1,18 @@
-from datetime import datetime
-
-from sqlalchemy import Column, DateTime, Integer, Float, ForeignKey, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
 
 
 class InfluencerMetric(Base):
-    id = Column(Integer, primary_key=True, index=True)
+    # autoincrement must be explicit: with the composite (id, timestamp)
+    # key SQLAlchemy no longer infers SERIAL for id on its own
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     influencer_id = Column(Integer, ForeignKey("influencer.id"), nullable=False)
-    
-    # Timestamp for this metric snapshot
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+
+    # Timestamp for this metric snapshot (TIMESTAMPTZ, stamped by the DB).
+    # Part of the primary key because it is the range-partition key
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True, primary_key=True)
     
     # Follower metrics
     follower_count = Column(Integer, default=0)
@@ -38,8 +39,16 @@ class InfluencerMetric(Base):
     trend_direction = Column(String, default="stable")  # growing, declining, stable
     trend_strength = Column(Float, default=0.0)  # 0.0 to 1.0
     
+    # Covers the per-influencer time-windowed scans in growth trends and scoring.
+    # Monthly range partitions on timestamp keep time-window scans pruned to the
+    # hot partition; see app.db.partitions for partition maintenance
+    __table_args__ = (
+        Index("ix_influencermetric_influencer_timestamp", influencer_id, timestamp.desc()),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
     # Relationships
-    influencer = relationship("Influencer", back_populates="metrics")
+    influencer = relationship("Influencer", back_populates="metrics", lazy="raise")
     
     def __repr__(self):
         return f"<InfluencerMetric {self.influencer_id} at {self.timestamp}>"
\ No newline at end of file
@@ -1,6 +1,5 @@
-from datetime import datetime
-
-from sqlalchemy import Column, DateTime, Integer, String, Text, Float, ForeignKey, Boolean, JSON
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -14,7 +13,7 @@ class Post(Base):
     # Post content
     caption = Column(Text, nullable=True)
     media_type = Column(String, nullable=False)  # IMAGE, VIDEO, CAROUSEL_ALBUM
-    media_urls = Column(JSON, nullable=True)  # List of media URLs for carousel posts
+    media_urls = Column(JSONB, nullable=True)  # List of media URLs for carousel posts
     permalink = Column(String, nullable=True)
     
     # Engagement metrics
@@ -26,20 +25,28 @@ class Post(Base):
     engagement_rate = Column(Float, default=0.0)  # Calculated field
     
     # Content analysis
-    hashtags = Column(JSON, nullable=True)  # List of hashtags used
-    mentioned_users = Column(JSON, nullable=True)  # List of users mentioned
+    hashtags = Column(JSONB, nullable=True)  # List of hashtags used
+    mentioned_users = Column(JSONB, nullable=True)  # List of users mentioned
     is_sponsored = Column(Boolean, default=False)  # Detected sponsored content
-    brands_mentioned = Column(JSON, nullable=True)  # Brands detected in post
+    brands_mentioned = Column(JSONB, nullable=True)  # Brands detected in post
     content_category = Column(String, nullable=True)  # Categorization of content
     content_quality_score = Column(Float, default=0.0)  # Calculated field
     
-    # Timestamps
-    posted_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps: TIMESTAMPTZ with server-side defaults, so the DB stamps
+    # rows instead of Python allocating a datetime per INSERT
+    posted_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    # Covers the per-influencer recent-post scans in the scoring engine;
+    # GIN index supports hashtag containment lookups
+    __table_args__ = (
+        Index("ix_post_influencer_posted_at", influencer_id, posted_at.desc()),
+        Index("ix_post_hashtags_gin", hashtags, postgresql_using="gin"),
+    )
+
     # Relationships
-    influencer = relationship("Influencer", back_populates="posts")
+    influencer = relationship("Influencer", back_populates="posts", lazy="raise")
     
     def __repr__(self):
         return f"<Post {self.instagram_id}>"
\ No newline at end of file
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Date, Integer, Float, ForeignKey
+
+from app.db.base_class import Base
+
+
+class DailyInfluencerRollup(Base):
+    # Pre-aggregated daily metrics so dashboard reads stay flat in history size
+    date = Column(Date, primary_key=True)
+    influencer_id = Column(Integer, ForeignKey("influencer.id"), primary_key=True)
+
+    avg_followers = Column(Integer, default=0)
+    avg_growth_rate = Column(Float, default=0.0)
+
+    def __repr__(self):
+        return f"<DailyInfluencerRollup {self.influencer_id} on {self.date}>"
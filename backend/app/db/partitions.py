@@ -0,0 +1,43 @@
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# InfluencerMetric and AudienceMetric are range-partitioned on timestamp
+# (monthly children), so time-window queries prune to the hot partition and
+# old months can be detached and archived instead of vacuumed forever.
+PARTITIONED_TABLES = ("influencermetric", "audiencemetric")
+
+
+def _month_start(year: int, month: int) -> date:
+    return date(year, month, 1)
+
+
+def _next_month(year: int, month: int) -> tuple:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def monthly_partition_ddl(table: str, year: int, month: int) -> str:
+    """Build the CREATE TABLE ... PARTITION OF statement for one month"""
+    next_year, next_month = _next_month(year, month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table}_y{year}m{month:02d} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{_month_start(year, month)}') "
+        f"TO ('{_month_start(next_year, next_month)}')"
+    )
+
+
+async def ensure_monthly_partitions(db: AsyncSession, months_ahead: int = 1) -> None:
+    """Create this month's and the next months_ahead partitions if missing
+
+    Run from a scheduled job (alongside the rollup backfill) so inserts never
+    land on a missing partition at month rollover.
+    """
+    now = datetime.now(timezone.utc)
+    year, month = now.year, now.month
+    for _ in range(months_ahead + 1):
+        for table in PARTITIONED_TABLES:
+            await db.execute(text(monthly_partition_ddl(table, year, month)))
+        year, month = _next_month(year, month)
+    await db.commit()
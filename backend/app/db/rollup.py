@@ -0,0 +1,42 @@
+from datetime import date as date_type
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.rollup import DailyInfluencerRollup
+
+
+def rollup_upsert(influencer_id: int, follower_count: int, growth_rate: float,
+                  day: date_type = None):
+    """Build an upsert statement for one influencer's rollup row for a day"""
+    stmt = insert(DailyInfluencerRollup).values(
+        date=day or date_type.today(),
+        influencer_id=influencer_id,
+        avg_followers=follower_count,
+        avg_growth_rate=growth_rate
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["date", "influencer_id"],
+        set_={
+            "avg_followers": stmt.excluded.avg_followers,
+            "avg_growth_rate": stmt.excluded.avg_growth_rate
+        }
+    )
+
+
+async def backfill_daily_rollup(db: AsyncSession) -> None:
+    """Rebuild the rollup from raw metrics (intended for a nightly job)"""
+    await db.execute(text("""
+        INSERT INTO dailyinfluencerrollup (date, influencer_id, avg_followers, avg_growth_rate)
+        SELECT date_trunc('day', timestamp)::date,
+               influencer_id,
+               avg(follower_count)::int,
+               avg(follower_growth_rate)
+        FROM influencermetric
+        GROUP BY 1, 2
+        ON CONFLICT (date, influencer_id) DO UPDATE
+            SET avg_followers = EXCLUDED.avg_followers,
+                avg_growth_rate = EXCLUDED.avg_growth_rate
+    """))
+    await db.commit()
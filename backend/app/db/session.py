@@ -1,17 +1,51 @@
+from typing import AsyncGenerator
+
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
+# Sync engine kept for the scoring engine and background scrape tasks.
+# executemany_mode batches bulk writes (metric/post snapshots) into
+# multi-VALUES INSERTs instead of one round-trip per row
+engine = create_engine(
+    settings.dsn,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    executemany_mode="values_plus_batch",
+    executemany_values_page_size=1000,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for request-path endpoints (analytics, influencer CRUD)
+ASYNC_DATABASE_URI = settings.dsn.replace(
+    "postgresql://", "postgresql+asyncpg://", 1
+)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URI,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800,  # Recycle before idle connections go stale after failovers
+)
+async_session = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an async DB session"""
+    async with async_session() as db:
+        yield db
+
 
-def get_db():
-    """Dependency for getting DB session"""
+def get_sync_db():
+    """Dependency for getting a sync DB session (scoring engine, scraper tasks)"""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
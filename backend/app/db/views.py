@@ -0,0 +1,40 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Materialized view holding each influencer's most recent metric snapshot,
+# so "latest metric" reads are one indexed lookup instead of an
+# ORDER BY timestamp DESC scan.
+#
+# No in-tree reader selects from it yet: the scoring engine needs full
+# 30/90-day metric windows (oldest and newest row, not just the latest) and
+# the dashboard aggregates read the daily rollup. The view exists for ad-hoc
+# and reporting queries over current snapshots; query it with text() until a
+# code path needs a mapped Table.
+
+CREATE_LATEST_METRIC_VIEW = text("""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS latest_influencer_metric AS
+    SELECT DISTINCT ON (influencer_id) *
+    FROM influencermetric
+    ORDER BY influencer_id, timestamp DESC
+""")
+
+# The unique index is required for REFRESH ... CONCURRENTLY
+CREATE_LATEST_METRIC_VIEW_INDEX = text("""
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_latest_influencer_metric
+    ON latest_influencer_metric (influencer_id)
+""")
+
+
+async def create_latest_metric_view(db: AsyncSession) -> None:
+    """Create the materialized view and its unique index if missing"""
+    await db.execute(CREATE_LATEST_METRIC_VIEW)
+    await db.execute(CREATE_LATEST_METRIC_VIEW_INDEX)
+    await db.commit()
+
+
+async def refresh_latest_metric_view(db: AsyncSession) -> None:
+    """Refresh the view without blocking readers (run from a scheduled job)"""
+    await db.execute(text(
+        "REFRESH MATERIALIZED VIEW CONCURRENTLY latest_influencer_metric"
+    ))
+    await db.commit()
@@ -1,25 +1,98 @@
-from fastapi import FastAPI
+import re
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+
+from app.core.cache import init_cache
+from app.core.config import settings
+from app.db.session import async_session
+
+# Influencer detail routes get weak ETags derived from updated_at
+_INFLUENCER_DETAIL_RE = re.compile(r"^/api/v1/influencers/(\d+)$")
+
+
+def create_app() -> FastAPI:
+    """Build the configured application
+
+    Router (and therefore schema/model) imports live inside the factory, so
+    with gunicorn --preload the parent process pays them once and forked
+    workers inherit the built app via copy-on-write:
+
+        gunicorn -w N -k uvicorn.workers.UvicornWorker --preload app.main:app
+    """
+    app = FastAPI(
+        title="Instagram Influencer Investment Analysis API",
+        description="API for analyzing Instagram influencers for venture capital investment opportunities",
+        version="0.1.0",
+        default_response_class=ORJSONResponse
+    )
+
+    # Configure CORS. A concrete origin list (BACKEND_CORS_ORIGINS) takes the
+    # middleware's fast set-membership path; the wildcard is the dev fallback
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=list(settings.BACKEND_CORS_ORIGINS) or ["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    @app.on_event("startup")
+    async def startup():
+        # Redis-backed response cache for the analytics endpoints
+        await init_cache()
+
+    @app.middleware("http")
+    async def influencer_etag(request: Request, call_next):
+        """Short-circuit unchanged influencer detail GETs with a 304
+
+        updated_at (stamped by the DB on every write) makes a perfect cache
+        key: one indexed SELECT replaces the whole query + serialization path
+        when the client already holds the current representation.
+        """
+        match = (
+            _INFLUENCER_DETAIL_RE.match(request.url.path)
+            if request.method == "GET" else None
+        )
+        if match is None:
+            return await call_next(request)
+
+        async with async_session() as db:
+            updated_at = await db.scalar(
+                text("SELECT updated_at FROM influencer WHERE id = :id"),
+                {"id": int(match.group(1))}
+            )
+        if updated_at is None:
+            return await call_next(request)
+
+        etag = f'W/"{match.group(1)}-{int(updated_at.timestamp())}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        response = await call_next(request)
+        if response.status_code == 200:
+            response.headers["ETag"] = etag
+        return response
+
+    @app.get("/")
+    async def root():
+        return {"message": "Welcome to the Instagram Influencer Investment Analysis API"}
+
+    @app.get("/health/db")
+    async def health_db():
+        """Verify a pooled DB connection can be checked out and used"""
+        async with async_session() as db:
+            await db.execute(text("SELECT 1"))
+        return {"status": "ok"}
+
+    # Imported here (not module top-level) so mapper and schema builds happen
+    # inside the factory, before workers fork
+    from app.api.api_v1.api import api_router
+    app.include_router(api_router, prefix="/api/v1")
+
+    return app
+
 
-app = FastAPI(
-    title="Instagram Influencer Investment Analysis API",
-    description="API for analyzing Instagram influencers for venture capital investment opportunities",
-    version="0.1.0"
-)
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Adjust this in production to specific origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-@app.get("/")
-async def root():
-    return {"message": "Welcome to the Instagram Influencer Investment Analysis API"}
-
-# Import and include API routers
-from app.api.api_v1.api import api_router
-app.include_router(api_router, prefix="/api/v1")
\ No newline at end of file
+app = create_app()
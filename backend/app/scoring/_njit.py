@@ -0,0 +1,17 @@
+# Optional numba support: njit compiles the decorated function when numba is
+# installed and is a no-op passthrough otherwise. numba is not a hard
+# dependency, so callers must keep a vectorized NumPy fallback for the
+# passthrough case (a plain-Python loop under the no-op would be slower).
+try:
+    from numba import njit  # noqa: F401
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        def decorator(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return decorator
@@ -1,12 +1,20 @@
 import logging
+import math
+import os
 import numpy as np
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from typing import Dict, List, Optional, Union
 
-from sqlalchemy.orm import Session
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session, load_only, selectinload
 
 from app.core.config import settings
 from app.db.models.influencer import Influencer
+from app.scoring._njit import NUMBA_AVAILABLE, njit
 from app.db.models.post import Post
 from app.db.models.metric import InfluencerMetric
 from app.db.models.audience import AudienceMetric
@@ -15,12 +23,105 @@ from app.db.models.audience import AudienceMetric
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared connection pool for memoized engagement rates; connects lazily
+_redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+# Default scoring based on general VC interest areas; higher weights for
+# tech, finance, business, lifestyle categories. Module-level so it is not
+# rebuilt on every brand-alignment call
+VC_INTEREST_WEIGHTS = {
+    "technology": 1.0,
+    "finance": 0.9,
+    "business": 0.9,
+    "entrepreneurship": 1.0,
+    "startups": 1.0,
+    "innovation": 0.9,
+    "lifestyle": 0.7,
+    "health": 0.8,
+    "fitness": 0.7,
+    "fashion": 0.6,
+    "beauty": 0.6,
+    "travel": 0.5,
+    "food": 0.5,
+    "entertainment": 0.4,
+    "gaming": 0.7,
+    "education": 0.8,
+    "science": 0.8
+}
+
+
+# Bit per known media type, for the diversity mask in content scoring
+_MEDIA_TYPE_BITS = {"IMAGE": 1, "VIDEO": 2, "CAROUSEL_ALBUM": 4}
+_ALL_MEDIA_TYPES = 7
+
+# Caption/hashtag bin edges and scores, built once at import; searchsorted
+# over these replaces per-call comparison ladders. Bins are right-closed:
+# caption <10 -> 0.3, <50 -> 0.6, <300 -> 1.0, <500 -> 0.8, else 0.5;
+# hashtags 0 -> 0.4, 1-5 -> 0.9, 6-15 -> 0.7, else 0.3
+_CAPTION_EDGES = np.array([10, 50, 300, 500])
+_CAPTION_BIN_SCORES = np.array([0.3, 0.6, 1.0, 0.8, 0.5])
+_HASHTAG_EDGES = np.array([1, 6, 16])
+_HASHTAG_BIN_SCORES = np.array([0.4, 0.9, 0.7, 0.3])
+
+
+@njit(cache=True)
+def _caption_quality_kernel(caption_lens, hashtag_counts):
+    """Per-post caption score: compiled by numba when available
+
+    Same binning as the NumPy fallback in calculate_content_quality_score;
+    a caption_len of -1 marks a missing caption.
+    """
+    n = caption_lens.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        length = caption_lens[i]
+        if length < 0:
+            out[i] = 0.3  # Penalty for no caption
+            continue
+
+        if length < 10:
+            length_score = 0.3
+        elif length < 50:
+            length_score = 0.6
+        elif length < 300:
+            length_score = 1.0
+        elif length < 500:
+            length_score = 0.8
+        else:
+            length_score = 0.5
+
+        count = hashtag_counts[i]
+        if count == 0:
+            hashtag_score = 0.4
+        elif count <= 5:
+            hashtag_score = 0.9
+        elif count <= 15:
+            hashtag_score = 0.7
+        else:
+            hashtag_score = 0.3
+
+        out[i] = (length_score + hashtag_score) / 2
+    return out
+
 
 class ScoringEngine:
     """Engine for calculating investment scores for influencers based on VC metrics"""
-    
+
+    _kernel_warmed = False
+
     def __init__(self, db: Session):
         self.db = db
+        # Request-scoped caches: calculate_overall_score clears these, so the
+        # five calculators share one influencer/audience-metric fetch instead
+        # of re-querying the same rows
+        self._influencer_cache: Dict[int, Influencer] = {}
+        self._audience_metric_cache: Dict[int, Optional[AudienceMetric]] = {}
+        # Trigger (cached) JIT compilation once per process, off the hot path
+        if NUMBA_AVAILABLE and not ScoringEngine._kernel_warmed:
+            _caption_quality_kernel(
+                np.zeros(2, dtype=np.int64), np.zeros(2, dtype=np.int64)
+            )
+            ScoringEngine._kernel_warmed = True
         # Load weights from settings
         self.engagement_weight = settings.ENGAGEMENT_RATE_WEIGHT
         self.growth_weight = settings.FOLLOWER_GROWTH_WEIGHT
@@ -28,59 +129,129 @@ class ScoringEngine:
         self.audience_quality_weight = settings.AUDIENCE_QUALITY_WEIGHT
         self.brand_alignment_weight = settings.BRAND_ALIGNMENT_WEIGHT
     
-    def calculate_engagement_rate(self, influencer_id: int) -> float:
-        """Calculate engagement rate based on recent posts"""
-        # Get the influencer
-        influencer = self.db.query(Influencer).filter(Influencer.id == influencer_id).first()
-        if not influencer:
-            logger.error(f"Influencer with ID {influencer_id} not found")
-            return 0.0
-        
-        # Get recent posts (last 30 days)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_posts = self.db.query(Post).filter(
-            Post.influencer_id == influencer_id,
-            Post.posted_at >= thirty_days_ago
-        ).all()
-        
-        if not recent_posts:
-            logger.warning(f"No recent posts found for influencer {influencer.username}")
+    @staticmethod
+    def _er_cache_get(cache_key: Optional[str]) -> Optional[float]:
+        """Fetch a memoized engagement rate; None on miss or Redis trouble"""
+        if cache_key is None:
+            return None
+        try:
+            cached = _redis.get(cache_key)
+        except RedisError:
+            return None
+        return float(cached) if cached is not None else None
+
+    @staticmethod
+    def _er_cache_set(cache_key: Optional[str], value: float) -> None:
+        if cache_key is None:
+            return
+        try:
+            _redis.set(cache_key, value)
+        except RedisError:
+            pass
+
+    def calculate_engagement_rate(self, influencer_id: int, influencer: Optional[Influencer] = None,
+                                  now: Optional[datetime] = None) -> float:
+        """Calculate engagement rate based on recent posts
+
+        Pass a preloaded influencer (with posts eager-loaded) to skip the
+        per-influencer queries; batch_update_scores does this so scoring N
+        influencers costs a handful of queries instead of several per row.
+        Without one, a single outer-joined aggregate query fetches the profile
+        fields and the 30-day engagement totals together — no Post or
+        Influencer objects are hydrated at all.
+        """
+        thirty_days_ago = (now or datetime.now(timezone.utc)) - timedelta(days=30)
+
+        if influencer is not None:
+            username = influencer.username
+            follower_count = influencer.follower_count
+            last_scraped_at = influencer.last_scraped_at
+            recent_posts = [
+                post for post in influencer.posts
+                if post.posted_at is not None and post.posted_at >= thirty_days_ago
+            ]
+            post_count = len(recent_posts)
+            total_engagement = sum(post.like_count + post.comment_count for post in recent_posts)
+        else:
+            row = self.db.query(
+                Influencer.username,
+                Influencer.follower_count,
+                Influencer.last_scraped_at,
+                func.coalesce(func.sum(Post.like_count + Post.comment_count), 0),
+                func.count(Post.id)
+            ).outerjoin(
+                Post, and_(
+                    Post.influencer_id == Influencer.id,
+                    Post.posted_at >= thirty_days_ago
+                )
+            ).filter(Influencer.id == influencer_id).group_by(Influencer.id).one_or_none()
+            if row is None:
+                logger.error(f"Influencer with ID {influencer_id} not found")
+                return 0.0
+            username, follower_count, last_scraped_at, total_engagement, post_count = row
+
+        # Memoize per scrape: the key encodes last_scraped_at, so a fresh
+        # scrape naturally moves to a new key and no TTL is needed
+        cache_key = None
+        if last_scraped_at:
+            cache_key = f"er:{influencer_id}:{int(last_scraped_at.timestamp())}"
+            cached = self._er_cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        if not post_count:
+            logger.warning(f"No recent posts found for influencer {username}")
             return 0.0
-        
+
         # Calculate average engagement per post
-        total_engagement = sum(post.like_count + post.comment_count for post in recent_posts)
-        avg_engagement_per_post = total_engagement / len(recent_posts)
-        
+        avg_engagement_per_post = total_engagement / post_count
+
         # Calculate engagement rate (engagement / followers)
-        if influencer.follower_count > 0:
-            engagement_rate = avg_engagement_per_post / influencer.follower_count
+        if follower_count > 0:
+            engagement_rate = avg_engagement_per_post / follower_count
         else:
             engagement_rate = 0.0
-        
+
         # Apply logarithmic scaling for large follower counts
         # This prevents unfair disadvantage for mega-influencers
-        if influencer.follower_count > 100000:  # 100k followers
-            follower_factor = np.log10(influencer.follower_count / 10000)
-            engagement_rate *= follower_factor
-        
-        return min(engagement_rate, 1.0)  # Cap at 1.0
-    
-    def calculate_growth_rate(self, influencer_id: int) -> float:
+        if follower_count > 100000:  # 100k followers
+            # math.log10 over np.log10: no ufunc dispatch for a single scalar
+            engagement_rate *= math.log10(follower_count / 10000)
+
+        engagement_rate = min(engagement_rate, 1.0)  # Cap at 1.0
+        self._er_cache_set(cache_key, engagement_rate)
+        return engagement_rate
+
+    def calculate_growth_rate(self, influencer_id: int, influencer: Optional[Influencer] = None,
+                              now: Optional[datetime] = None) -> float:
         """Calculate follower growth rate over time"""
-        # Get historical metrics for the past 90 days
-        ninety_days_ago = datetime.utcnow() - timedelta(days=90)
-        metrics = self.db.query(InfluencerMetric).filter(
-            InfluencerMetric.influencer_id == influencer_id,
-            InfluencerMetric.timestamp >= ninety_days_ago
-        ).order_by(InfluencerMetric.timestamp).all()
-        
-        if len(metrics) < 2:
-            logger.warning(f"Not enough historical data for influencer {influencer_id}")
-            return 0.0
-        
-        # Get oldest and newest metrics
-        oldest_metric = metrics[0]
-        newest_metric = metrics[-1]
+        # Only the window endpoints matter, so fetch exactly those. The
+        # preloaded path scans the already-loaded metrics; otherwise two
+        # LIMIT 1 lookups on the (influencer_id, timestamp DESC) index
+        # replace materializing the whole 90-day history
+        ninety_days_ago = (now or datetime.now(timezone.utc)) - timedelta(days=90)
+        if influencer is not None:
+            metrics = sorted(
+                (m for m in influencer.metrics if m.timestamp >= ninety_days_ago),
+                key=lambda m: m.timestamp
+            )
+            if len(metrics) < 2:
+                logger.warning(f"Not enough historical data for influencer {influencer_id}")
+                return 0.0
+            oldest_metric = metrics[0]
+            newest_metric = metrics[-1]
+        else:
+            window = self.db.query(InfluencerMetric).options(
+                load_only(InfluencerMetric.timestamp, InfluencerMetric.follower_count)
+            ).filter(
+                InfluencerMetric.influencer_id == influencer_id,
+                InfluencerMetric.timestamp >= ninety_days_ago
+            )
+            oldest_metric = window.order_by(InfluencerMetric.timestamp.asc()).first()
+            newest_metric = window.order_by(InfluencerMetric.timestamp.desc()).first()
+            if oldest_metric is None or oldest_metric.id == newest_metric.id:
+                logger.warning(f"Not enough historical data for influencer {influencer_id}")
+                return 0.0
         
         # Calculate time difference in days
         time_diff = (newest_metric.timestamp - oldest_metric.timestamp).days
@@ -103,107 +274,113 @@ class ScoringEngine:
         
         return normalized_growth_rate
     
-    def calculate_content_quality_score(self, influencer_id: int) -> float:
+    def calculate_content_quality_score(self, influencer_id: int, influencer: Optional[Influencer] = None) -> float:
         """Calculate content quality score based on post performance"""
-        # Get the influencer
-        influencer = self.db.query(Influencer).filter(Influencer.id == influencer_id).first()
-        if not influencer:
-            return 0.0
-        
-        # Get recent posts
-        recent_posts = self.db.query(Post).filter(
-            Post.influencer_id == influencer_id
-        ).order_by(Post.posted_at.desc()).limit(20).all()
-        
+        preloaded = influencer is not None
+        if not preloaded:
+            # Get the influencer
+            influencer = self._get_influencer(influencer_id)
+            if not influencer:
+                return 0.0
+
+        # Get the 20 most recent posts
+        if preloaded:
+            epoch = datetime.min.replace(tzinfo=timezone.utc)
+            recent_posts = sorted(
+                influencer.posts,
+                key=lambda p: p.posted_at or epoch,
+                reverse=True
+            )[:20]
+        else:
+            # Only the columns the arrays below read; skips materializing
+            # media_urls, mentioned_users and the other wide JSON columns
+            recent_posts = self.db.query(Post).options(
+                load_only(
+                    Post.posted_at, Post.like_count, Post.comment_count,
+                    Post.media_type, Post.caption, Post.hashtags
+                )
+            ).filter(
+                Post.influencer_id == influencer_id
+            ).order_by(Post.posted_at.desc()).limit(20).all()
+
         if not recent_posts:
             return 0.0
         
         # Calculate metrics for content quality
         total_posts = len(recent_posts)
-        
+
+        # Stage the per-post fields as NumPy arrays once; every sub-score
+        # below is a vectorized pass over these instead of a Python loop
+        posted_ts = np.array(
+            [post.posted_at.timestamp() for post in recent_posts if post.posted_at],
+            dtype=np.float64
+        )
+        engagement = np.array(
+            [post.like_count + post.comment_count for post in recent_posts],
+            dtype=np.float64
+        )
+        # -1 marks a missing caption so np.select can branch on it below
+        caption_lens = np.array(
+            [len(post.caption) if post.caption else -1 for post in recent_posts],
+            dtype=np.int64
+        )
+        hashtag_counts = np.array(
+            [len(post.hashtags) if post.hashtags else 0 for post in recent_posts],
+            dtype=np.int64
+        )
+
         # 1. Consistency score - regular posting schedule
         if total_posts >= 2:
-            post_dates = [post.posted_at for post in recent_posts if post.posted_at]
-            post_dates.sort(reverse=True)
-            
-            # Calculate average days between posts
-            intervals = [(post_dates[i] - post_dates[i+1]).days 
-                        for i in range(len(post_dates)-1) if post_dates[i] and post_dates[i+1]]
-            
-            if intervals:
-                avg_interval = sum(intervals) / len(intervals)
-                # Variance in posting schedule (lower is better)
-                if len(intervals) > 1:
-                    variance = sum((interval - avg_interval) ** 2 for interval in intervals) / len(intervals)
+            if posted_ts.size >= 2:
+                # Days between consecutive posts; variance in posting
+                # schedule (lower is better)
+                intervals = np.diff(np.sort(posted_ts)) / 86400.0
+                if intervals.size > 1:
                     # Normalize variance (0-1 where 1 is perfectly consistent)
-                    consistency_score = 1.0 / (1.0 + variance/10)  # Adjust divisor as needed
+                    consistency_score = 1.0 / (1.0 + intervals.var() / 10)  # Adjust divisor as needed
                 else:
                     consistency_score = 0.7  # Default for limited data
             else:
                 consistency_score = 0.5
         else:
             consistency_score = 0.3  # Low score for very few posts
-        
+
         # 2. Engagement consistency - how consistently posts perform
-        engagement_rates = []
-        for post in recent_posts:
-            if influencer.follower_count > 0:
-                post_engagement = (post.like_count + post.comment_count) / influencer.follower_count
-                engagement_rates.append(post_engagement)
-        
-        if engagement_rates:
-            avg_engagement = sum(engagement_rates) / len(engagement_rates)
-            if len(engagement_rates) > 1:
-                engagement_variance = sum((rate - avg_engagement) ** 2 for rate in engagement_rates) / len(engagement_rates)
+        if influencer.follower_count > 0 and engagement.size:
+            engagement_rates = engagement / influencer.follower_count
+            if engagement_rates.size > 1:
                 # Normalize (0-1 where 1 is consistently engaging content)
-                engagement_consistency = 1.0 / (1.0 + engagement_variance * 100)  # Scale factor
+                engagement_consistency = 1.0 / (1.0 + engagement_rates.var() * 100)  # Scale factor
             else:
                 engagement_consistency = 0.7
         else:
             engagement_consistency = 0.5
-        
-        # 3. Media diversity score - mix of image, video, carousel
-        media_types = {post.media_type for post in recent_posts if post.media_type}
-        media_diversity = len(media_types) / 3.0  # Normalize by max types (IMAGE, VIDEO, CAROUSEL_ALBUM)
-        
-        # 4. Caption quality - based on length and hashtag usage
-        caption_scores = []
+
+        # 3. Media diversity score - mix of image, video, carousel, tracked
+        # as a 3-bit mask (no set allocation) with an early exit once all
+        # types were seen. Normalized by max types (IMAGE, VIDEO, CAROUSEL_ALBUM)
+        media_seen = 0
         for post in recent_posts:
-            if not post.caption:
-                caption_scores.append(0.3)  # Penalty for no caption
-                continue
-                
-            # Length score - favor moderate length captions
-            caption_length = len(post.caption)
-            if caption_length < 10:
-                length_score = 0.3  # Too short
-            elif caption_length < 50:
-                length_score = 0.6  # Short but acceptable
-            elif caption_length < 300:
-                length_score = 1.0  # Ideal length
-            elif caption_length < 500:
-                length_score = 0.8  # Getting long
-            else:
-                length_score = 0.5  # Too long
-            
-            # Hashtag score - favor moderate hashtag usage
-            if not post.hashtags:
-                hashtag_count = 0
-            else:
-                hashtag_count = len(post.hashtags)
-                
-            if hashtag_count == 0:
-                hashtag_score = 0.4  # No hashtags
-            elif hashtag_count <= 5:
-                hashtag_score = 0.9  # Good amount
-            elif hashtag_count <= 15:
-                hashtag_score = 0.7  # Getting excessive
-            else:
-                hashtag_score = 0.3  # Hashtag spam
-            
-            caption_scores.append((length_score + hashtag_score) / 2)
-        
-        avg_caption_score = sum(caption_scores) / len(caption_scores) if caption_scores else 0.5
+            media_seen |= _MEDIA_TYPE_BITS.get(post.media_type, 0)
+            if media_seen == _ALL_MEDIA_TYPES:
+                break
+        media_diversity = bin(media_seen).count("1") / 3.0
+
+        # 4. Caption quality - based on length and hashtag usage. The JIT
+        # kernel fuses the binning into one compiled loop; without numba,
+        # np.select/np.where cover the same bins vectorized. A missing
+        # caption scores a flat 0.3 regardless of hashtags
+        if NUMBA_AVAILABLE:
+            caption_scores = _caption_quality_kernel(caption_lens, hashtag_counts)
+        else:
+            length_scores = _CAPTION_BIN_SCORES[
+                np.searchsorted(_CAPTION_EDGES, caption_lens, side="right")
+            ]
+            hashtag_scores = _HASHTAG_BIN_SCORES[
+                np.searchsorted(_HASHTAG_EDGES, hashtag_counts, side="right")
+            ]
+            caption_scores = np.where(caption_lens < 0, 0.3, (length_scores + hashtag_scores) / 2)
+        avg_caption_score = float(caption_scores.mean()) if caption_scores.size else 0.5
         
         # Combine all factors with weights
         content_quality_score = (
@@ -215,13 +392,45 @@ class ScoringEngine:
         
         return min(content_quality_score, 1.0)  # Cap at 1.0
     
-    def calculate_audience_quality_score(self, influencer_id: int) -> float:
-        """Calculate audience quality score based on audience metrics"""
-        # Get latest audience metrics
-        audience_metric = self.db.query(AudienceMetric).filter(
+    def _load_bundle(self, influencer_id: int) -> Optional[Influencer]:
+        """Load an influencer with posts, metrics and audience metrics eagerly
+
+        One selectinload query set replaces the separate post/metric/audience
+        queries the calculators would otherwise each run for the same row.
+        """
+        return self.db.query(Influencer).options(
+            selectinload(Influencer.posts),
+            selectinload(Influencer.metrics),
+            selectinload(Influencer.audience_metrics)
+        ).filter(Influencer.id == influencer_id).first()
+
+    def _get_influencer(self, influencer_id: int) -> Optional[Influencer]:
+        """Fetch an influencer row, reusing the request-scoped cache"""
+        influencer = self._influencer_cache.get(influencer_id)
+        if influencer is None:
+            influencer = self.db.query(Influencer).filter(Influencer.id == influencer_id).first()
+            if influencer is not None:
+                self._influencer_cache[influencer_id] = influencer
+        return influencer
+
+    def _latest_audience_metric(self, influencer_id: int, influencer: Optional[Influencer] = None) -> Optional[AudienceMetric]:
+        """Most recent audience metric, from the preloaded relationship if given"""
+        if influencer is not None:
+            return max(influencer.audience_metrics, key=lambda m: m.timestamp, default=None)
+        if influencer_id in self._audience_metric_cache:
+            return self._audience_metric_cache[influencer_id]
+        metric = self.db.query(AudienceMetric).filter(
             AudienceMetric.influencer_id == influencer_id
         ).order_by(AudienceMetric.timestamp.desc()).first()
-        
+        # None is cached too: a missing metric should not trigger re-queries
+        self._audience_metric_cache[influencer_id] = metric
+        return metric
+
+    def calculate_audience_quality_score(self, influencer_id: int, influencer: Optional[Influencer] = None) -> float:
+        """Calculate audience quality score based on audience metrics"""
+        # Get latest audience metrics
+        audience_metric = self._latest_audience_metric(influencer_id, influencer)
+
         if not audience_metric:
             logger.warning(f"No audience metrics found for influencer {influencer_id}")
             return 0.5  # Default middle score when no data available
@@ -252,74 +461,58 @@ class ScoringEngine:
         
         return min(audience_quality_score, 1.0)  # Cap at 1.0
     
-    def calculate_brand_alignment_score(self, influencer_id: int, industry_categories: List[str] = None) -> float:
+    def calculate_brand_alignment_score(self, influencer_id: int, industry_categories: List[str] = None,
+                                        influencer: Optional[Influencer] = None) -> float:
         """Calculate brand alignment score based on content categories and audience interests"""
         # This would typically be customized per VC firm's investment focus
         # For now, we'll use a simplified approach
-        
-        # Get the influencer
-        influencer = self.db.query(Influencer).filter(Influencer.id == influencer_id).first()
-        if not influencer:
-            return 0.0
-        
+
+        preloaded = influencer is not None
+        if not preloaded:
+            # Get the influencer
+            influencer = self._get_influencer(influencer_id)
+            if not influencer:
+                return 0.0
+
         # Get latest audience metrics for interest categories
-        audience_metric = self.db.query(AudienceMetric).filter(
-            AudienceMetric.influencer_id == influencer_id
-        ).order_by(AudienceMetric.timestamp.desc()).first()
-        
+        audience_metric = self._latest_audience_metric(
+            influencer_id, influencer if preloaded else None
+        )
+
         # Default alignment score if no data
         if not audience_metric or not audience_metric.interest_categories:
             return 0.5
         
         # If no specific industry categories provided, use a default scoring
         if not industry_categories:
-            # Default scoring based on general VC interest areas
-            # Higher weights for tech, finance, business, lifestyle categories
-            vc_interest_weights = {
-                "technology": 1.0,
-                "finance": 0.9,
-                "business": 0.9,
-                "entrepreneurship": 1.0,
-                "startups": 1.0,
-                "innovation": 0.9,
-                "lifestyle": 0.7,
-                "health": 0.8,
-                "fitness": 0.7,
-                "fashion": 0.6,
-                "beauty": 0.6,
-                "travel": 0.5,
-                "food": 0.5,
-                "entertainment": 0.4,
-                "gaming": 0.7,
-                "education": 0.8,
-                "science": 0.8
-            }
-            
-            # Calculate weighted score based on audience interests
-            total_weight = 0
-            weighted_sum = 0
-            
-            for category, percentage in audience_metric.interest_categories.items():
-                category_lower = category.lower()
-                weight = vc_interest_weights.get(category_lower, 0.5)  # Default weight for unknown categories
-                weighted_sum += percentage * weight
-                total_weight += percentage
-            
+            # Weighted score over audience interests as one dot product:
+            # parallel percentage/weight arrays instead of a Python loop
+            # (0.5 is the default weight for unknown categories)
+            interests = audience_metric.interest_categories
+            percentages = np.fromiter(interests.values(), dtype=np.float64, count=len(interests))
+            weights = np.fromiter(
+                (VC_INTEREST_WEIGHTS.get(category.lower(), 0.5) for category in interests),
+                dtype=np.float64, count=len(interests)
+            )
+
+            total_weight = percentages.sum()
             if total_weight > 0:
-                alignment_score = weighted_sum / total_weight
+                alignment_score = float(percentages @ weights) / total_weight
             else:
                 alignment_score = 0.5
         else:
-            # Calculate alignment based on specified industry categories
+            # Calculate alignment based on specified industry categories.
+            # Lowercase the interest map once, not per requested category
+            lowered = {k.lower(): v for k, v in audience_metric.interest_categories.items()}
             alignment_scores = []
-            
+
             for category in industry_categories:
                 category_lower = category.lower()
                 # Check if this category exists in audience interests
-                if category_lower in {k.lower(): v for k, v in audience_metric.interest_categories.items()}:
+                if category_lower in lowered:
                     # Higher score for stronger match
-                    alignment_scores.append(audience_metric.interest_categories.get(category_lower, 0))
-            
+                    alignment_scores.append(lowered[category_lower])
+
             if alignment_scores:
                 alignment_score = sum(alignment_scores) / len(alignment_scores)
             else:
@@ -327,14 +520,26 @@ class ScoringEngine:
         
         return min(alignment_score, 1.0)  # Cap at 1.0
     
-    def calculate_overall_score(self, influencer_id: int, industry_categories: List[str] = None) -> Dict[str, float]:
+    def calculate_overall_score(self, influencer_id: int, industry_categories: List[str] = None,
+                                influencer: Optional[Influencer] = None,
+                                now: Optional[datetime] = None) -> Dict[str, float]:
         """Calculate overall investment score and component scores"""
+        # Fresh request scope: the calculators below share one fetch per row
+        # through the caches instead of re-querying each other's data
+        self._influencer_cache.clear()
+        self._audience_metric_cache.clear()
+
+        # Load the whole bundle up front so every calculator below runs on
+        # preloaded data; batch callers pass their own preloaded influencer
+        if influencer is None:
+            influencer = self._load_bundle(influencer_id)
+
         # Calculate individual component scores
-        engagement_rate = self.calculate_engagement_rate(influencer_id)
-        growth_rate = self.calculate_growth_rate(influencer_id)
-        content_quality = self.calculate_content_quality_score(influencer_id)
-        audience_quality = self.calculate_audience_quality_score(influencer_id)
-        brand_alignment = self.calculate_brand_alignment_score(influencer_id, industry_categories)
+        engagement_rate = self.calculate_engagement_rate(influencer_id, influencer, now)
+        growth_rate = self.calculate_growth_rate(influencer_id, influencer, now)
+        content_quality = self.calculate_content_quality_score(influencer_id, influencer)
+        audience_quality = self.calculate_audience_quality_score(influencer_id, influencer)
+        brand_alignment = self.calculate_brand_alignment_score(influencer_id, industry_categories, influencer)
         
         # Calculate weighted overall score
         overall_score = (
@@ -355,13 +560,22 @@ class ScoringEngine:
             "brand_alignment_score": brand_alignment
         }
     
-    def update_influencer_scores(self, influencer_id: int, industry_categories: List[str] = None) -> Dict[str, float]:
-        """Calculate and update scores for an influencer in the database"""
+    def update_influencer_scores(self, influencer_id: int, industry_categories: List[str] = None,
+                                 commit: bool = True) -> Dict[str, float]:
+        """Calculate and update scores for an influencer in the database
+
+        Pass commit=False when batching several updates into one transaction;
+        the caller then owns the final commit.
+        """
+        # Load once, with relationships: the same instance feeds the
+        # calculators and receives the new scores, so there is no second
+        # lookup for the write-back
+        influencer = self._load_bundle(influencer_id)
+
         # Calculate scores
-        scores = self.calculate_overall_score(influencer_id, industry_categories)
-        
+        scores = self.calculate_overall_score(influencer_id, industry_categories, influencer=influencer)
+
         # Update influencer record
-        influencer = self.db.query(Influencer).filter(Influencer.id == influencer_id).first()
         if influencer:
             influencer.engagement_rate = scores["engagement_rate"]
             influencer.growth_rate = scores["growth_rate"]
@@ -369,26 +583,163 @@ class ScoringEngine:
             influencer.audience_quality_score = scores["audience_quality_score"]
             influencer.brand_alignment_score = scores["brand_alignment_score"]
             influencer.overall_investment_score = scores["overall_investment_score"]
-            
+
             # Save to database
-            self.db.commit()
+            if commit:
+                self.db.commit()
             logger.info(f"Updated scores for influencer {influencer.username}")
         else:
             logger.error(f"Influencer with ID {influencer_id} not found")
         
         return scores
     
+    def recompute_overall_scores(self) -> int:
+        """Recompute overall scores from stored component scores for all influencers
+
+        The overall score is a weighted sum of the five component columns, so
+        rather than looping over influencers in Python this stacks the
+        components into an (N, 5) feature matrix and computes all scores with
+        a single ``features @ weights`` matmul, then writes them back in one
+        bulk UPDATE. Use this when weights change or after components were
+        refreshed out of band; it does not recompute the components themselves.
+        """
+        weights = np.array([
+            self.engagement_weight,
+            self.growth_weight,
+            self.content_quality_weight,
+            self.audience_quality_weight,
+            self.brand_alignment_weight
+        ], dtype=np.float32)
+
+        # Stream id + component columns as plain tuples via a server-side cursor
+        stmt = select(
+            Influencer.id,
+            func.coalesce(Influencer.engagement_rate, 0.0),
+            func.coalesce(Influencer.growth_rate, 0.0),
+            func.coalesce(Influencer.content_quality_score, 0.0),
+            func.coalesce(Influencer.audience_quality_score, 0.0),
+            func.coalesce(Influencer.brand_alignment_score, 0.0)
+        ).execution_options(yield_per=10000)
+        rows = self.db.execute(stmt).all()
+
+        if not rows:
+            return 0
+
+        # Keep ids in int64: folded into the float32 matrix they lose
+        # precision above 2**24 and would address the wrong rows
+        ids = np.asarray([row[0] for row in rows], dtype=np.int64)
+        features = np.asarray([row[1:] for row in rows], dtype=np.float32)
+        scores = features @ weights
+
+        self.db.bulk_update_mappings(Influencer, [
+            {"id": int(influencer_id), "overall_investment_score": float(score)}
+            for influencer_id, score in zip(ids, scores)
+        ])
+        self.db.commit()
+        logger.info(f"Recomputed overall scores for {len(rows)} influencers")
+
+        return len(rows)
+
+    def normalize_audience_ratios(self) -> int:
+        """Renormalize audience follower ratios so each row sums to 1.0
+
+        Scraped authentic/bot/inactive ratios can drift from summing to one
+        (rounding, partial estimates). Instead of checking row by row in
+        Python, this stacks all rows into a float32 (N, 3) matrix, rescales
+        the off-by-more-than-epsilon rows in one vectorized pass and bulk
+        UPDATEs only those rows.
+        """
+        stmt = select(
+            AudienceMetric.id,
+            AudienceMetric.timestamp,
+            func.coalesce(AudienceMetric.authentic_followers_ratio, 0.0),
+            func.coalesce(AudienceMetric.bot_followers_ratio, 0.0),
+            func.coalesce(AudienceMetric.inactive_followers_ratio, 0.0)
+        ).execution_options(yield_per=10000)
+        rows = self.db.execute(stmt).all()
+
+        if not rows:
+            return 0
+
+        # The composite primary key (id, timestamp) stays in Python objects;
+        # only the ratio columns go through the float32 matrix (ids would
+        # lose precision above 2**24 there)
+        keys = [(row[0], row[1]) for row in rows]
+        ratios = np.asarray([row[2:] for row in rows], dtype=np.float32)
+        sums = ratios.sum(axis=1)
+
+        # Only touch rows that actually deviate and can be rescaled
+        off = (np.abs(sums - 1.0) > 1e-3) & (sums > 0)
+        if not off.any():
+            return 0
+
+        fixed = ratios[off] / sums[off, np.newaxis]
+
+        self.db.bulk_update_mappings(AudienceMetric, [
+            {
+                "id": keys[row_index][0],
+                "timestamp": keys[row_index][1],
+                "authentic_followers_ratio": float(authentic),
+                "bot_followers_ratio": float(bot),
+                "inactive_followers_ratio": float(inactive)
+            }
+            for row_index, (authentic, bot, inactive)
+            in zip(np.flatnonzero(off), fixed)
+        ])
+        self.db.commit()
+        logger.info(f"Renormalized audience ratios for {int(off.sum())} metric rows")
+
+        return int(off.sum())
+
     def batch_update_scores(self, industry_categories: List[str] = None) -> int:
-        """Update scores for all influencers in the database"""
-        influencers = self.db.query(Influencer).all()
-        updated_count = 0
-        
-        for influencer in influencers:
+        """Update scores for all influencers in the database
+
+        Eager-loads posts, metrics and audience metrics in a handful of
+        selectinload queries, scores each influencer from the preloaded
+        objects (no per-influencer round-trips), then writes everything back
+        with one bulk UPDATE and a single commit.
+        """
+        # Stream 500 influencers at a time from a server-side cursor; the
+        # selectinload batches follow per chunk, so peak memory is bounded by
+        # the chunk instead of the whole table
+        influencers = self.db.query(Influencer).options(
+            selectinload(Influencer.posts),
+            selectinload(Influencer.metrics),
+            selectinload(Influencer.audience_metrics)
+        ).yield_per(500)
+
+        # One batch-scope reference time, instead of fresh datetime/timedelta
+        # allocations inside every calculator for every influencer
+        now = datetime.now(timezone.utc)
+
+        def score_one(influencer: Influencer) -> Optional[Dict[str, float]]:
             try:
-                self.update_influencer_scores(influencer.id, industry_categories)
-                updated_count += 1
+                scores = self.calculate_overall_score(
+                    influencer.id, industry_categories, influencer=influencer, now=now
+                )
+                return {"id": influencer.id, **scores}
             except Exception as e:
                 logger.error(f"Error updating scores for influencer {influencer.username}: {str(e)}")
-                continue
-        
-        return updated_count
\ No newline at end of file
+                return None
+
+        # Each influencer scores independently from its preloaded objects (no
+        # session access), so chunks fan out across a thread pool — the NumPy
+        # sweeps release the GIL. Chunking by hand keeps the yield_per
+        # streaming bounded; executor.map would drain the cursor eagerly
+        updates = []
+        rows = iter(influencers)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            while True:
+                chunk = list(islice(rows, 500))
+                if not chunk:
+                    break
+                updates.extend(
+                    result for result in executor.map(score_one, chunk)
+                    if result is not None
+                )
+
+        if updates:
+            self.db.bulk_update_mappings(Influencer, updates)
+            self.db.commit()
+
+        return len(updates)
\ No newline at end of file